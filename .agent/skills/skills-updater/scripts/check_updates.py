@@ -3,7 +3,8 @@
 Skill Update Checker - Scans installed skills and checks for available updates.
 
 Usage:
-    python check_updates.py [--skill <name>] [--json]
+    python check_updates.py [--skill <name>] [--json] [--workers <n>] [--deadline <seconds>]
+                            [--cache-ttl <seconds>] [--no-cache] [--timings]
 
 Examples:
     python check_updates.py                    # Check all installed skills
@@ -15,22 +16,51 @@ import json
 import sys
 import argparse
 import io
+import threading
+import time
 from pathlib import Path
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+import urllib.parse
 import urllib.error
 
 # Import i18n module
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
 from i18n import get_i18n, t  # noqa: E402
+from http_client import format_timings, get_client  # noqa: E402
+
+
+# Update checks run concurrently, bounded per host and by an overall deadline
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 4
+REQUEST_TIMEOUT = 10
+CHECK_DEADLINE = 60.0
+
+# Remote metadata is cached on disk and revalidated with ETag/Last-Modified
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_TTL = 300  # Seconds a cached response is reused without any request
+HTTP_CACHE_VERSION = 1  # Bumped when cached bodies change meaning; older cache files are ignored
+
+# Refs tried for a repo's default branch; the one that worked is remembered per repo
+REFS = ("main", "HEAD")
+REF_NOT_FOUND = (404, 422)  # raw.githubusercontent.com: 404; GitHub API commits: 404 or 422
+
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_host_limits_lock = threading.Lock()
+_deadline: Optional[float] = None  # time.monotonic() by which checks must finish
+_http_cache: Optional[Dict[str, Dict]] = None
+_http_cache_lock = threading.Lock()
+_http_cache_dirty = False
+_repo_refs: Optional[Dict[str, str]] = None
+_repo_refs_lock = threading.Lock()
 
 
 class UpdateStatus(Enum):
@@ -53,6 +83,13 @@ class SkillInfo:
     error_message: Optional[str] = None
 
 
+@dataclass
+class RepoState:
+    """Remote metadata of a marketplace repo, fetched once per run and shared by its skills."""
+    marketplace_json: Optional[Dict] = None
+    commit_sha: Optional[str] = None
+
+
 def get_plugins_dir() -> Path:
     """Get the Claude Code plugins directory."""
     return Path.home() / ".claude" / "plugins"
@@ -78,6 +115,84 @@ def load_known_marketplaces() -> Dict:
         return json.load(f)
 
 
+def get_http_cache_file() -> Path:
+    """Get the on-disk cache of remote marketplace metadata."""
+    return get_plugins_dir() / "skills-updater-http-cache.json"
+
+
+def get_repo_refs_file() -> Path:
+    """Get the file remembering which ref each marketplace repo resolves to."""
+    return get_plugins_dir() / "skills-updater-refs.json"
+
+
+def _write_json(path: Path, data: Dict):
+    """Write a JSON file atomically, ignoring failures (the data is only a cache)."""
+    import os
+    import tempfile
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _load_http_cache() -> Dict[str, Dict]:
+    """Load the HTTP cache (url -> body, etag, last_modified, fetched_at) once per process."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            try:
+                with open(get_http_cache_file(), encoding='utf-8') as f:
+                    data = json.load(f)
+                _http_cache = data["entries"] if data.get("version") == HTTP_CACHE_VERSION else {}
+            except (OSError, ValueError, AttributeError, KeyError):
+                _http_cache = {}
+        return _http_cache
+
+
+def _store_http_cache(url: str, entry: Dict):
+    """Record a response in memory; save_http_cache() writes the file."""
+    global _http_cache_dirty
+    cache = _load_http_cache()
+    with _http_cache_lock:
+        cache[url] = entry
+        _http_cache_dirty = True
+
+
+def save_http_cache():
+    """Write the HTTP cache file if any response was recorded since it was loaded."""
+    global _http_cache_dirty
+    with _http_cache_lock:
+        if _http_cache_dirty:
+            _write_json(get_http_cache_file(), {"version": HTTP_CACHE_VERSION, "entries": _http_cache})
+            _http_cache_dirty = False
+
+
+def _load_repo_refs() -> Dict[str, str]:
+    """Load the repo -> resolved ref map once per process."""
+    global _repo_refs
+    with _repo_refs_lock:
+        if _repo_refs is None:
+            try:
+                with open(get_repo_refs_file(), encoding='utf-8') as f:
+                    _repo_refs = json.load(f)
+            except (OSError, ValueError):
+                _repo_refs = {}
+        return _repo_refs
+
+
+def _remember_ref(repo: str, ref: str):
+    """Persist the ref a repo resolved to, if it changed."""
+    refs = _load_repo_refs()
+    with _repo_refs_lock:
+        if refs.get(repo) != ref:
+            refs[repo] = ref
+            _write_json(get_repo_refs_file(), refs)
+
+
 def parse_plugin_key(key: str) -> Tuple[str, str]:
     """Parse plugin key into (skill_name, marketplace)."""
     parts = key.rsplit("@", 1)
@@ -107,54 +222,113 @@ def get_github_repo_from_marketplace(marketplace_name: str, marketplaces: Dict)
     return None
 
 
-def fetch_remote_marketplace_json(repo: str) -> Optional[Dict]:
-    """Fetch marketplace.json from GitHub repo."""
-    url = f"https://raw.githubusercontent.com/{repo}/main/.claude-plugin/marketplace.json"
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    """Get the semaphore bounding concurrent requests to a URL's host."""
+    host = urllib.parse.urlsplit(url).hostname or ""
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+def fetch_text(url: str, headers: Optional[Dict] = None) -> str:
+    """GET a URL and return its body as text, within the per-host limit and the check deadline.
+
+    Responses are cached on disk: one younger than HTTP_CACHE_TTL is returned
+    without a request, an older one is revalidated with If-None-Match /
+    If-Modified-Since and reused on 304 Not Modified.
+
+    Requests share the keep-alive connections of http_client.get_client().
+    Raises urllib errors as urlopen() does, or TimeoutError once the deadline has passed.
+    """
+    cached = _load_http_cache().get(url) if HTTP_CACHE_ENABLED else None
+    if cached and time.time() - cached["fetched_at"] < HTTP_CACHE_TTL:
+        return cached["body"]
+
+    request_headers = dict(headers or {})
+    if cached and cached.get("etag"):
+        request_headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    with _host_limit(url):
+        timeout = REQUEST_TIMEOUT
+        if _deadline is not None:
+            timeout = min(timeout, _deadline - time.monotonic())
+            if timeout <= 0:
+                raise TimeoutError("Update check deadline exceeded")
+        try:
+            response = get_client().get(url, request_headers, timeout)
+        except urllib.error.HTTPError:
+            raise
+        except urllib.error.URLError:
+            if _deadline is not None and time.monotonic() >= _deadline:
+                raise TimeoutError("Update check deadline exceeded")  # Timed out on the clipped timeout
+            raise
+
+    if response.status == 304 and cached:
+        body, etag, last_modified = cached["body"], cached.get("etag"), cached.get("last_modified")
+    else:
+        body = response.text()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
 
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "skills-updater/1.0"})
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            # Try HEAD branch instead of main
-            url_head = url.replace("/main/", "/HEAD/")
-            try:
-                req = urllib.request.Request(url_head, headers={"User-Agent": "skills-updater/1.0"})
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    return json.loads(response.read().decode())
-            except Exception:
-                pass
-        return None
-    except Exception:
-        return None
+    if HTTP_CACHE_ENABLED:
+        _store_http_cache(url, {"body": body, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()})
+    return body
 
 
-def fetch_remote_commit_sha(repo: str) -> Optional[str]:
-    """Fetch the latest commit SHA from GitHub."""
-    url = f"https://api.github.com/repos/{repo}/commits/main"
+def fetch_json(url: str, headers: Optional[Dict] = None) -> Dict:
+    """GET a URL and parse its JSON body, as fetch_text() does."""
+    return json.loads(fetch_text(url, headers))
 
-    try:
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "skills-updater/1.0",
-            "Accept": "application/vnd.github.v3+json"
-        })
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            return data.get("sha")
-    except Exception:
-        # Try HEAD branch
-        url_head = url.replace("/main", "/HEAD")
+
+def fetch_from_ref(repo: str, url_for_ref: Callable[[str], str], headers: Optional[Dict] = None,
+                   fetch: Callable[[str, Optional[Dict]], object] = fetch_json):
+    """Fetch from the repo's default branch with `fetch` (JSON by default), trying its remembered ref first.
+
+    Only a "not found" answer moves on to the next ref in REFS; network
+    errors return None straight away, as another ref would not help, and
+    TimeoutError propagates once the check deadline has passed. The ref that
+    worked is remembered for the next run.
+    """
+    known = _load_repo_refs().get(repo)
+    refs = [known] + [ref for ref in REFS if ref != known] if known else list(REFS)
+    for ref in refs:
         try:
-            req = urllib.request.Request(url_head, headers={
-                "User-Agent": "skills-updater/1.0",
-                "Accept": "application/vnd.github.v3+json"
-            })
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                return data.get("sha")
+            data = fetch(url_for_ref(ref), headers)
+        except urllib.error.HTTPError as e:
+            if e.code in REF_NOT_FOUND:
+                continue
+            return None
+        except TimeoutError:
+            raise
         except Exception:
             return None
+        _remember_ref(repo, ref)
+        return data
+    return None
+
+
+def fetch_remote_marketplace_json(repo: str) -> Optional[Dict]:
+    """Fetch marketplace.json from GitHub repo."""
+    return fetch_from_ref(repo, lambda ref: f"https://raw.githubusercontent.com/{repo}/{ref}/.claude-plugin/marketplace.json")
+
+
+def fetch_remote_commit_sha(repo: str) -> Optional[str]:
+    """Fetch the latest commit SHA from GitHub.
+
+    The sha media type makes the API answer with just the 40-character SHA
+    instead of the full commit, whose diff can run to megabytes.
+    """
+    sha = fetch_from_ref(repo, lambda ref: f"https://api.github.com/repos/{repo}/commits/{ref}",
+                         {"Accept": "application/vnd.github.sha"}, fetch_text)
+    return (sha.strip() or None) if sha else None
+
+
+def fetch_repo_state(repo: str) -> RepoState:
+    """Fetch a repo's marketplace.json and latest commit SHA."""
+    return RepoState(fetch_remote_marketplace_json(repo), fetch_remote_commit_sha(repo))
 
 
 def get_skill_version_from_marketplace_json(marketplace_json: Dict, skill_name: str) -> Optional[str]:
@@ -201,8 +375,26 @@ def compare_commit_sha(local_sha: Optional[str], remote_sha: Optional[str]) -> b
     return local_sha[:min_len] != remote_sha[:min_len]
 
 
-def check_skill_update(skill_name: str, marketplace: str, plugin_info: Dict, marketplaces: Dict) -> SkillInfo:
-    """Check if a skill has an available update."""
+def error_info(skill_name: str, marketplace: str, plugin_info: Dict, message: str) -> SkillInfo:
+    """SkillInfo for a skill whose update check failed."""
+    return SkillInfo(
+        name=skill_name,
+        marketplace=marketplace,
+        local_version=plugin_info.get("version", "unknown"),
+        remote_version=None,
+        status=UpdateStatus.ERROR,
+        install_path=plugin_info.get("installPath", ""),
+        git_commit_sha=plugin_info.get("gitCommitSha"),
+        error_message=message
+    )
+
+
+def check_skill_update(skill_name: str, marketplace: str, plugin_info: Dict, marketplaces: Dict,
+                       repo_state: Optional[RepoState] = None) -> SkillInfo:
+    """Check if a skill has an available update.
+
+    repo_state is the already-fetched state of the skill's repo; it is fetched here if omitted.
+    """
     local_version = plugin_info.get("version", "unknown")
     install_path = plugin_info.get("installPath", "")
     git_commit_sha = plugin_info.get("gitCommitSha")
@@ -211,26 +403,20 @@ def check_skill_update(skill_name: str, marketplace: str, plugin_info: Dict, mar
     repo = get_github_repo_from_marketplace(marketplace, marketplaces)
 
     if not repo:
-        return SkillInfo(
-            name=skill_name,
-            marketplace=marketplace,
-            local_version=local_version,
-            remote_version=None,
-            status=UpdateStatus.ERROR,
-            install_path=install_path,
-            git_commit_sha=git_commit_sha,
-            error_message="Could not determine GitHub repo"
-        )
+        return error_info(skill_name, marketplace, plugin_info, "Could not determine GitHub repo")
+
+    if repo_state is None:
+        repo_state = fetch_repo_state(repo)
 
     # Try to get remote version from marketplace.json
-    remote_marketplace = fetch_remote_marketplace_json(repo)
+    remote_marketplace = repo_state.marketplace_json
     remote_version = None
 
     if remote_marketplace:
         remote_version = get_skill_version_from_marketplace_json(remote_marketplace, skill_name)
 
-    # Fetch remote commit SHA as fallback
-    remote_commit = fetch_remote_commit_sha(repo)
+    # Remote commit SHA as fallback
+    remote_commit = repo_state.commit_sha
 
     # Determine update status
     if local_version in ["unknown", "", None]:
@@ -269,12 +455,54 @@ def check_skill_update(skill_name: str, marketplace: str, plugin_info: Dict, mar
     )
 
 
-def check_all_updates(filter_skill: Optional[str] = None) -> List[SkillInfo]:
-    """Check updates for all installed skills."""
+def fetch_repo_states(repos: List[str], max_workers: int = MAX_WORKERS,
+                      deadline: Optional[float] = None) -> Dict[str, Optional[RepoState]]:
+    """Fetch the state of each repo once, concurrently.
+
+    Repos whose requests hit the deadline (`deadline` seconds; none if 0 or
+    None) or are still running after it map to None.
+    """
+    fetchers = (fetch_remote_marketplace_json, fetch_remote_commit_sha)
+    tasks = [(repo, fetch) for repo in repos for fetch in fetchers]
+    if max_workers <= 1 or len(tasks) <= 1:
+        states = {}
+        for repo in repos:
+            try:
+                states[repo] = fetch_repo_state(repo)
+            except TimeoutError:
+                states[repo] = None
+        return states
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)))
+    futures = [executor.submit(fetch, repo) for repo, fetch in tasks]
+    wait(futures, timeout=deadline or None)
+    # Do not block on stragglers: their requests fail fast once the deadline has passed
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    states = {}
+    for i, repo in enumerate(repos):
+        marketplace_future, commit_future = futures[2 * i:2 * i + 2]
+        finished = all(f.done() and not f.cancelled() and f.exception() is None
+                       for f in (marketplace_future, commit_future))
+        states[repo] = RepoState(marketplace_future.result(), commit_future.result()) if finished else None
+    return states
+
+
+def check_all_updates(filter_skill: Optional[str] = None, max_workers: int = MAX_WORKERS,
+                      deadline: Optional[float] = CHECK_DEADLINE) -> List[SkillInfo]:
+    """Check updates for all installed skills.
+
+    Skills are grouped by marketplace repo, and each repo's marketplace.json
+    and latest commit are fetched once, on up to max_workers threads with at
+    most PER_HOST_LIMIT requests in flight per host. Skills whose repo could
+    not be fetched within `deadline` seconds (0 or None: no deadline) are
+    reported as errors. Results keep installed_plugins.json order.
+    """
+    global _deadline
     installed = load_installed_plugins()
     marketplaces = load_known_marketplaces()
 
-    results = []
+    checks = []
 
     for key, plugin_list in installed.get("plugins", {}).items():
         if not plugin_list:
@@ -288,9 +516,30 @@ def check_all_updates(filter_skill: Optional[str] = None) -> List[SkillInfo]:
         # Use the first (usually only) plugin entry
         plugin_info = plugin_list[0]
 
-        skill_info = check_skill_update(skill_name, marketplace, plugin_info, marketplaces)
-        results.append(skill_info)
+        checks.append((skill_name, marketplace, plugin_info))
 
+    repos = []
+    for _, marketplace, _ in checks:
+        repo = get_github_repo_from_marketplace(marketplace, marketplaces)
+        if repo and repo not in repos:
+            repos.append(repo)
+
+    deadline = deadline or None
+    _deadline = time.monotonic() + deadline if deadline else None
+    try:
+        states = fetch_repo_states(repos, max_workers, deadline)
+
+        results = []
+        for skill_name, marketplace, plugin_info in checks:
+            repo = get_github_repo_from_marketplace(marketplace, marketplaces)
+            if repo and states[repo] is None:
+                results.append(error_info(skill_name, marketplace, plugin_info, "Update check timed out"))
+            else:
+                results.append(check_skill_update(skill_name, marketplace, plugin_info, marketplaces, states.get(repo)))
+    finally:
+        _deadline = None  # Later fetch_text() calls, outside this run, are not bound by it
+
+    save_http_cache()
     return results
 
 
@@ -362,13 +611,25 @@ def print_results(results: List[SkillInfo], as_json: bool = False):
 
 
 def main():
+    global HTTP_CACHE_TTL, HTTP_CACHE_ENABLED
     parser = argparse.ArgumentParser(description="Check for skill updates")
     parser.add_argument("--skill", help="Check specific skill only")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--lang", choices=["en", "zh"],
                         help="Language for output (auto-detected if not specified)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Request threads; each repo takes two requests (default: {MAX_WORKERS})")
+    parser.add_argument("--deadline", type=float, default=CHECK_DEADLINE,
+                        help=f"Give up on checks still running after this many seconds, 0 for no limit (default: {CHECK_DEADLINE:g})")
+    parser.add_argument("--cache-ttl", type=float, default=HTTP_CACHE_TTL,
+                        help=f"Reuse cached remote metadata younger than this many seconds without revalidating (default: {HTTP_CACHE_TTL})")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the HTTP cache")
+    parser.add_argument("--timings", action="store_true", help="Report per-request HTTP timings to stderr")
     args = parser.parse_args()
 
+    HTTP_CACHE_TTL = args.cache_ttl
+    HTTP_CACHE_ENABLED = not args.no_cache
+
     # Initialize i18n
     if args.lang:
         get_i18n(args.lang)
@@ -376,7 +637,10 @@ def main():
     if not args.json:
         print(f"🔍 {t('checking_updates')}\n")
 
-    results = check_all_updates(filter_skill=args.skill)
+    results = check_all_updates(filter_skill=args.skill, max_workers=args.workers, deadline=args.deadline)
+
+    if args.timings:
+        print(format_timings(get_client().timings), file=sys.stderr)
 
     if not results:
         if args.skill:
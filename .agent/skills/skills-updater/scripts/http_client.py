@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for skills-updater scripts.
+
+Keeps persistent keep-alive connections per host (most requests go to
+raw.githubusercontent.com and api.github.com), so repeated requests skip the
+TCP and TLS handshakes. Applies consistent timeouts and user agent, decodes
+gzip responses, follows redirects and records the timing of every request.
+
+Usage:
+    from http_client import get_client
+    response = get_client().get("https://api.github.com/repos/owner/repo")
+    data = response.json()
+"""
+
+import base64
+import gzip
+import http.client
+import json
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_USER_AGENT = "skills-updater/1.0"
+DEFAULT_TIMEOUT = 10
+MAX_IDLE_PER_HOST = 4
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+@dataclass
+class Response:
+    url: str
+    status: int
+    headers: http.client.HTTPMessage  # Case-insensitive: headers.get("ETag")
+    body: bytes
+    elapsed: float
+    reused_connection: bool
+
+    def text(self) -> str:
+        """Decode the body as UTF-8."""
+        return self.body.decode("utf-8")
+
+    def json(self):
+        """Parse the body as JSON."""
+        return json.loads(self.text())
+
+
+@dataclass
+class RequestTiming:
+    method: str
+    url: str
+    status: Optional[int]
+    seconds: float
+    reused_connection: bool
+
+
+class HTTPClient:
+    """Thread-safe HTTP client with a keep-alive connection pool per host.
+
+    Responses with status >= 400 raise urllib.error.HTTPError and connection
+    failures raise urllib.error.URLError, as urllib.request.urlopen() does;
+    304 Not Modified is returned like any other response.
+    """
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, timeout: float = DEFAULT_TIMEOUT,
+                 max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.timings: List[RequestTiming] = []
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _connect(self, scheme: str, host: str, port: int, timeout: float) -> http.client.HTTPConnection:
+        """Open a new connection, tunnelling through the environment's proxy if one applies.
+
+        Only plain http:// proxies are supported (the CONNECT request is not encrypted).
+        """
+        proxy = urllib.request.getproxies().get(scheme)
+        if proxy and not urllib.request.proxy_bypass(host):
+            proxy_url = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            if proxy_url.scheme.lower() != "http":
+                raise urllib.error.URLError(f"Unsupported proxy scheme: {proxy_url.scheme} ({scheme}_proxy)")
+            conn = self._new_connection(scheme, proxy_url.hostname, proxy_url.port or 80, timeout)
+            headers = {}
+            if proxy_url.username is not None:
+                credentials = f"{urllib.parse.unquote(proxy_url.username)}:{urllib.parse.unquote(proxy_url.password or '')}"
+                headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+            conn.set_tunnel(host, port, headers=headers)
+            return conn
+        return self._new_connection(scheme, host, port, timeout)
+
+    def _new_connection(self, scheme: str, host: str, port: int, timeout: float) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(self, key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Get an idle connection to a host, or a new one; returns (connection, reused)."""
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._connect(*key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection):
+        """Return a connection to the pool, closing it if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], timeout: float) -> Response:
+        """Send one request (no redirects), retrying once if a reused connection went stale."""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"Unsupported URL scheme: {scheme}")
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"User-Agent": self.user_agent, "Accept-Encoding": "gzip", **headers}
+
+        start = time.perf_counter()
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, headers=headers)
+                raw = conn.getresponse()
+                body = raw.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    continue  # Server closed the idle connection; retry on a fresh one
+                self._record(method, url, None, start, reused)
+                raise urllib.error.URLError(e) from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                self._record(method, url, None, start, reused)
+                raise urllib.error.URLError(e) from e
+            break
+
+        response_headers = raw.headers
+        if raw.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        if (response_headers.get("Content-Encoding") or "").lower() == "gzip":
+            body = gzip.decompress(body)
+        self._record(method, url, raw.status, start, reused)
+        return Response(url, raw.status, response_headers, body, time.perf_counter() - start, reused)
+
+    def _record(self, method: str, url: str, status: Optional[int], start: float, reused: bool):
+        timing = RequestTiming(method, url, status, time.perf_counter() - start, reused)
+        with self._lock:
+            self.timings.append(timing)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> Response:
+        """Send a request, following redirects."""
+        timeout = self.timeout if timeout is None else timeout
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, headers or {}, timeout)
+            if response.status not in REDIRECT_CODES or "Location" not in response.headers:
+                break
+            url = urllib.parse.urljoin(url, response.headers["Location"])
+            if response.status == 303:
+                method = "GET"
+        if response.status >= 400 or response.status in REDIRECT_CODES:
+            raise urllib.error.HTTPError(url, response.status, http.client.responses.get(response.status, ""),
+                                         response.headers, None)
+        return response
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Response:
+        """Send a GET request."""
+        return self.request("GET", url, headers, timeout)
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """Get the process-wide shared client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
+
+
+def format_timings(timings: List[RequestTiming]) -> str:
+    """Format request timings, one line per request plus a summary."""
+    lines = []
+    for timing in timings:
+        status = timing.status if timing.status is not None else "ERR"
+        connection = "reused" if timing.reused_connection else "new"
+        lines.append(f"{timing.seconds * 1000:8.1f} ms  {status}  {connection:<6}  {timing.method} {timing.url}")
+    total = sum(timing.seconds for timing in timings)
+    reused = sum(1 for timing in timings if timing.reused_connection)
+    lines.append(f"{len(timings)} requests, {reused} on reused connections, {total * 1000:.1f} ms total")
+    return "\n".join(lines)
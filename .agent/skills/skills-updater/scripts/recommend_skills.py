@@ -30,13 +30,13 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass
-import urllib.request
 from html.parser import HTMLParser
 
 # Import i18n module
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
 from i18n import get_i18n, t  # noqa: E402
+from http_client import get_client  # noqa: E402
 
 
 @dataclass
@@ -123,11 +123,10 @@ def fetch_skills_sh(limit: int = 20) -> List[RecommendedSkill]:
     url = "https://skills.sh/"
 
     try:
-        req = urllib.request.Request(url, headers={
+        response = get_client().get(url, headers={
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) skills-updater/1.0"
-        })
-        with urllib.request.urlopen(req, timeout=15) as response:
-            html = response.read().decode("utf-8")
+        }, timeout=15)
+        html = response.text()
     except Exception as e:
         print(f"Warning: Could not fetch skills.sh: {e}", file=sys.stderr)
         return get_hardcoded_skills_sh_top(limit)
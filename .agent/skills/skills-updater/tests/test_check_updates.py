@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Update checker tests, run against a fake HTTP client and a temporary plugins directory.
+Run: python -m unittest discover -s tests
+"""
+
+import http.client
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.parse
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import check_updates
+from check_updates import UpdateStatus, check_all_updates
+from http_client import Response
+
+
+def make_response(url, status=200, body="", headers=None):
+    message = http.client.HTTPMessage()
+    for name, value in (headers or {}).items():
+        message[name] = value
+    return Response(url, status, message, body.encode("utf-8"), 0.0, False)
+
+
+class FakeClient:
+    """Stands in for http_client.HTTPClient: answers through handler(url, headers) and records requests."""
+
+    def __init__(self, handler, delay=0.0):
+        self.handler = handler
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._active = Counter()
+        self.peak = Counter()
+
+    def get(self, url, headers=None, timeout=None):
+        host = urllib.parse.urlsplit(url).hostname
+        with self._lock:
+            self.requests.append((url, dict(headers or {})))
+            self._active[host] += 1
+            self.peak[host] = max(self.peak[host], self._active[host])
+        try:
+            time.sleep(self.delay)
+            return self.handler(url, headers or {}, timeout)
+        finally:
+            with self._lock:
+                self._active[host] -= 1
+
+    def urls(self):
+        return [url for url, _ in self.requests]
+
+
+def github(url, headers, timeout):
+    """Default handler: every repo publishes skills a-f at 1.1.0, at commit c0ffee..."""
+    if "/commits/" in url:
+        return make_response(url, body="c0ffee0000000000000000000000000000000000")
+    return make_response(url, body=json.dumps({"plugins": [{"name": name, "version": "1.1.0"} for name in "abcdef"]}))
+
+
+class CheckUpdatesTestCase(unittest.TestCase):
+    """Isolates the checker's module state and plugins directory per test."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.plugins_dir = Path(self.tmp.name)
+        for patcher in (mock.patch.object(check_updates, "get_plugins_dir", return_value=self.plugins_dir),
+                        mock.patch.multiple(check_updates, _host_limits={}, _deadline=None, _http_cache=None,
+                                            _http_cache_dirty=False, _repo_refs=None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def use_client(self, handler=github, delay=0.0):
+        client = FakeClient(handler, delay)
+        patcher = mock.patch.object(check_updates, "get_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return client
+
+    def install(self, skills):
+        """Install skills given as {name: repo}, each from a marketplace named after its repo."""
+        plugins = {f"{name}@{repo}": [{"version": "1.0.0", "installPath": f"/skills/{name}"}]
+                   for name, repo in skills.items()}
+        marketplaces = {repo: {"source": {"source": "github", "repo": repo}} for repo in set(skills.values())}
+        (self.plugins_dir / "installed_plugins.json").write_text(json.dumps({"version": 2, "plugins": plugins}))
+        (self.plugins_dir / "known_marketplaces.json").write_text(json.dumps(marketplaces))
+
+
+class ConcurrencyTest(CheckUpdatesTestCase):
+
+    def test_per_host_limit(self):
+        self.install({name: f"owner/repo-{name}" for name in "abcdef"})
+        client = self.use_client(delay=0.05)
+        with mock.patch.object(check_updates, "PER_HOST_LIMIT", 2):
+            results = check_all_updates(max_workers=8)
+        self.assertEqual([r.status for r in results], [UpdateStatus.UPDATE_AVAILABLE] * 6)
+        self.assertEqual(set(client.peak), {"raw.githubusercontent.com", "api.github.com"})
+        self.assertTrue(all(peak <= 2 for peak in client.peak.values()), client.peak)
+
+    def test_deadline(self):
+        def slow_repo(url, headers, timeout):
+            if "/slow/" in url:
+                time.sleep(timeout)
+                raise urllib.error.URLError(TimeoutError("timed out"))
+            return github(url, headers, timeout)
+
+        self.install({"a": "owner/fast", "b": "owner/slow"})
+        self.use_client(slow_repo)
+        for workers in (8, 1):
+            with self.subTest(workers=workers):
+                start = time.monotonic()
+                results = check_all_updates(max_workers=workers, deadline=0.3)
+                self.assertLess(time.monotonic() - start, 2)
+                self.assertEqual(results[0].status, UpdateStatus.UPDATE_AVAILABLE)
+                self.assertEqual((results[1].status, results[1].error_message),
+                                 (UpdateStatus.ERROR, "Update check timed out"))
+                self.assertIsNone(check_updates._deadline)
+
+    def test_zero_deadline_means_none(self):
+        self.install({"a": "owner/repo1", "b": "owner/repo2"})
+        self.use_client(delay=0.05)
+        for workers in (8, 1):
+            with self.subTest(workers=workers):
+                results = check_all_updates(max_workers=workers, deadline=0)
+                self.assertEqual([r.status for r in results], [UpdateStatus.UPDATE_AVAILABLE] * 2)
+
+
+class RepoDedupTest(CheckUpdatesTestCase):
+
+    def test_each_repo_fetched_once(self):
+        self.install({"a": "owner/shared", "b": "owner/shared", "c": "owner/shared", "d": "owner/other"})
+        for workers in (8, 1):
+            with self.subTest(workers=workers):
+                check_updates._http_cache = {}
+                client = self.use_client()
+                results = check_all_updates(max_workers=workers)
+                self.assertEqual([r.name for r in results], ["a", "b", "c", "d"])
+                self.assertEqual(sorted(client.urls()), sorted([
+                    "https://raw.githubusercontent.com/owner/shared/main/.claude-plugin/marketplace.json",
+                    "https://api.github.com/repos/owner/shared/commits/main",
+                    "https://raw.githubusercontent.com/owner/other/main/.claude-plugin/marketplace.json",
+                    "https://api.github.com/repos/owner/other/commits/main"
+                ]))
+
+
+def etag_github(url, headers, timeout):
+    """github() with ETags: answers 304 to a matching If-None-Match."""
+    if headers.get("If-None-Match") == '"v1"':
+        return make_response(url, 304, headers={"ETag": '"v1"'})
+    response = github(url, headers, timeout)
+    response.headers["ETag"] = '"v1"'
+    return response
+
+
+class HttpCacheTest(CheckUpdatesTestCase):
+
+    def new_run(self, handler=etag_github):
+        """Check again as a new process would: cache reloaded from disk, fresh client."""
+        check_updates._http_cache = None
+        client = self.use_client(handler)
+        return check_all_updates(), client
+
+    def test_fresh_entries_skip_requests(self):
+        self.install({"a": "owner/repo"})
+        first, client = self.new_run()
+        self.assertEqual(len(client.requests), 2)
+        second, client = self.new_run()
+        self.assertEqual(client.requests, [])
+        self.assertEqual(second, first)
+
+    def test_stale_entries_revalidate(self):
+        self.install({"a": "owner/repo"})
+        first, _ = self.new_run()
+        with mock.patch.object(check_updates, "HTTP_CACHE_TTL", 0):
+            second, client = self.new_run()
+        self.assertEqual([headers.get("If-None-Match") for _, headers in client.requests], ['"v1"', '"v1"'])
+        self.assertEqual(second, first)
+        self.assertEqual(second[0].remote_commit_sha, "c0ffee000000")
+
+    def test_cache_holds_sha_and_is_written_once(self):
+        self.install({"a": "owner/repo", "b": "owner/other"})
+        with mock.patch.object(check_updates, "_write_json", wraps=check_updates._write_json) as write:
+            _, client = self.new_run()
+        cache_writes = [call for call in write.call_args_list if call.args[0] == check_updates.get_http_cache_file()]
+        self.assertEqual(len(cache_writes), 1)
+        commit_headers = [headers for url, headers in client.requests if "/commits/" in url]
+        self.assertEqual([headers["Accept"] for headers in commit_headers], ["application/vnd.github.sha"] * 2)
+
+        cache = json.loads(check_updates.get_http_cache_file().read_text())
+        self.assertEqual(cache["version"], check_updates.HTTP_CACHE_VERSION)
+        entry = cache["entries"]["https://api.github.com/repos/owner/repo/commits/main"]
+        self.assertEqual(entry["body"], "c0ffee0000000000000000000000000000000000")
+
+    def test_no_cache(self):
+        self.install({"a": "owner/repo"})
+        with mock.patch.object(check_updates, "HTTP_CACHE_ENABLED", False):
+            self.new_run()
+            _, client = self.new_run()
+        self.assertEqual(len(client.requests), 2)
+        self.assertFalse(check_updates.get_http_cache_file().exists())
+
+
+class RefFallbackTest(CheckUpdatesTestCase):
+
+    @staticmethod
+    def head_only(url, headers, timeout):
+        """A repo whose default branch is not "main": raw 404s, the commits API 422s."""
+        if "/main/" in url or url.endswith("/main"):
+            raise urllib.error.HTTPError(url, 422 if "/commits/" in url else 404, "Not Found", None, None)
+        return github(url, headers, timeout)
+
+    def test_not_found_falls_back_and_is_remembered(self):
+        self.install({"a": "owner/repo"})
+        client = self.use_client(self.head_only)
+        results = check_all_updates(max_workers=1)
+        self.assertEqual(results[0].status, UpdateStatus.UPDATE_AVAILABLE)
+        self.assertEqual(len(client.requests), 3)  # The commit request already starts from the learnt ref
+        self.assertEqual(json.loads(check_updates.get_repo_refs_file().read_text()), {"owner/repo": "HEAD"})
+
+        check_updates._repo_refs = None
+        check_updates._http_cache = {}
+        client = self.use_client(self.head_only)
+        check_all_updates(max_workers=1)
+        self.assertEqual(client.urls(), [
+            "https://raw.githubusercontent.com/owner/repo/HEAD/.claude-plugin/marketplace.json",
+            "https://api.github.com/repos/owner/repo/commits/HEAD"
+        ])
+
+    def test_other_errors_do_not_fall_back(self):
+        errors = {
+            "network": urllib.error.URLError(ConnectionRefusedError("refused")),
+            "server": urllib.error.HTTPError("", 500, "Server Error", None, None)
+        }
+        self.install({"a": "owner/repo"})
+        for name, error in errors.items():
+            with self.subTest(error=name):
+                check_updates._http_cache = {}
+
+                def failing(url, headers, timeout):
+                    raise error
+
+                client = self.use_client(failing)
+                results = check_all_updates(max_workers=1)
+                self.assertEqual(results[0].status, UpdateStatus.UNKNOWN_VERSION)
+                self.assertTrue(all("/main" in url for url in client.urls()), client.urls())
+                self.assertFalse(check_updates.get_repo_refs_file().exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
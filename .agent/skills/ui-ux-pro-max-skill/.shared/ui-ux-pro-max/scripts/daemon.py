@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Daemon - keeps all indexes warm and answers JSON requests
+over a local socket (Unix domain socket, or localhost TCP where unavailable).
+
+Usage:
+    python search.py --serve          # start the daemon (foreground)
+    python search.py --stop-server    # stop a running daemon
+    python search.py "<query>" ...    # uses the daemon automatically if running
+
+Protocol: one JSON object per line, e.g.
+    {"op": "search", "args": {"query": "saas", "domain": "product", "max_results": 3}}
+and one JSON reply per line:
+    {"ok": true, "result": ...}  or  {"ok": false, "error": "..."}
+
+The socket and its token live in a per-user directory of mode 0700. Over TCP
+every request must carry the daemon's token ({"token": ...}, read from that
+directory), so other local users and cross-protocol requests from a browser
+are refused. The daemon never writes files: persisting a design system always
+runs in the client.
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+import zlib
+
+from core import DATA_DIR, build_indexes, cache_stats, search, search_all, search_many, search_stack, similar
+
+# ============ CONFIGURATION ============
+CONNECT_TIMEOUT = 0.2
+REQUEST_TIMEOUT = 60
+_INSTANCE_ID = zlib.crc32(str(DATA_DIR.resolve()).encode('utf-8'))
+
+
+def _runtime_dir(create=False):
+    """Per-user directory (mode 0700) holding the daemon's socket and token.
+
+    Raises OSError if it is missing (unless create) or could be reached by other users.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or os.environ.get("TEMP") or "/tmp"
+    if hasattr(os, "getuid"):
+        user = os.getuid()
+    else:
+        import getpass
+        user = getpass.getuser()
+    path = os.path.join(base, f"ui-ux-pro-max-{user}")
+    if create:
+        try:
+            os.mkdir(path, 0o700)
+        except FileExistsError:
+            pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Not a directory: {path}")
+    if hasattr(os, "getuid") and (info.st_uid != user or info.st_mode & 0o077):
+        raise PermissionError(f"Daemon directory is not private to this user: {path}")
+    return path
+
+
+def daemon_address(create=False):
+    """Socket address of the daemon serving this data directory"""
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(_runtime_dir(create), f"{_INSTANCE_ID:08x}.sock")
+    return ("127.0.0.1", 20000 + _INSTANCE_ID % 10000)
+
+
+def _token_path(create=False):
+    """File holding the token TCP clients must send"""
+    return os.path.join(_runtime_dir(create), f"{_INSTANCE_ID:08x}.token")
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is reachable, or it failed to answer a request"""
+
+
+# ============ REQUEST HANDLING ============
+def _writes_files(op, args):
+    """Whether a request would write files; the daemon refuses these and dispatch() runs them locally"""
+    return op == "design_system" and bool((args or {}).get("persist"))
+
+
+def _design_system(query, project_name=None, output_format="ascii", persist=False, page=None, output_dir=None, pages=None):
+    """Generate (and optionally persist) a design system; returns output text and persist report"""
+    from design_system import generate_design_system
+    persisted = {}
+    output = generate_design_system(query, project_name, output_format, persist=persist, page=page,
+                                    output_dir=output_dir, pages=pages, persist_result=persisted)
+    return {"output": output, "persist": persisted}
+
+
+OPS = {
+    "ping": lambda: "pong",
+    "search": search,
+    "search_stack": search_stack,
+    "search_many": search_many,
+    "search_all": search_all,
+    "similar": similar,
+    "design_system": _design_system,
+    "cache_stats": cache_stats
+}
+
+
+def execute(op, args=None):
+    """Run an operation in this process"""
+    if op not in OPS:
+        raise ValueError(f"Unknown op: {op}. Available: {', '.join(OPS)}")
+    return OPS[op](**(args or {}))
+
+
+def _handle_connection(handler):
+    """Answer newline-delimited JSON requests until the client disconnects.
+
+    A malformed or unauthenticated request closes the connection, so nothing
+    after e.g. the header lines of an HTTP request gets through.
+    """
+    import hmac
+    token = handler.server.token
+    for line in handler.rfile:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            _reply(handler, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+            break
+        if token and not hmac.compare_digest(str(message.get("token", "")), token):
+            _reply(handler, {"ok": False, "error": "PermissionError: Missing or invalid daemon token"})
+            break
+        try:
+            op = message.get("op")
+            if _writes_files(op, message.get("args")):
+                raise PermissionError("The daemon does not write files; persist in the client")
+            if op == "shutdown":
+                import threading
+                threading.Thread(target=handler.server.shutdown, daemon=True).start()
+                reply = {"ok": True, "result": "bye"}
+            else:
+                reply = {"ok": True, "result": execute(op, message.get("args"))}
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        _reply(handler, reply)
+
+
+def _reply(handler, reply):
+    handler.wfile.write(json.dumps(reply, ensure_ascii=False).encode('utf-8') + b"\n")
+    handler.wfile.flush()
+
+
+def _write_token():
+    """Write a fresh random token, readable only by this user; returns it"""
+    import secrets
+    token = secrets.token_hex(32)
+    path = _token_path(create=True)
+    if os.path.exists(path):
+        os.unlink(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+
+def _make_server(address):
+    """Bind a threaded server on a Unix socket path or a TCP address (which then requires a token)"""
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        handle = _handle_connection
+
+    if isinstance(address, str):
+        umask = os.umask(0o177)  # Socket is never accessible to others, not even before a chmod
+        try:
+            server = socketserver.ThreadingUnixStreamServer(address, Handler)
+        finally:
+            os.umask(umask)
+        server.token = None
+    else:
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer(address, Handler)
+        server.token = _write_token()
+    server.daemon_threads = True
+    return server
+
+
+def serve(address=None, quiet=False):
+    """Warm every index and serve requests until shut down"""
+    address = address or daemon_address(create=True)
+    try:
+        request("ping", address=address)
+        print(f"Daemon already running at {address}", file=sys.stderr)
+        return 1
+    except DaemonUnavailable:
+        pass
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)  # Stale socket from a daemon that did not exit cleanly
+
+    built = build_indexes()
+    server = _make_server(address)
+    if not quiet:
+        print(f"UI Pro Max search daemon: {len(built)} indexes warm, listening on {address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in (address if isinstance(address, str) else None, server.token and _token_path()):
+            if path and os.path.exists(path):
+                os.unlink(path)
+    return 0
+
+
+# ============ CLIENT ============
+def request(op, address=None, **args):
+    """Send one request to the daemon and return its result"""
+    message = {"op": op, "args": args}
+    try:
+        address = address or daemon_address()
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        if family == socket.AF_INET:
+            with open(_token_path(), 'r', encoding='utf-8') as f:
+                message["token"] = f.read().strip()
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(address)
+            sock.settimeout(REQUEST_TIMEOUT)
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+            with sock.makefile('rb') as f:
+                line = f.readline()
+    except OSError as e:
+        raise DaemonUnavailable(str(e)) from e
+
+    try:
+        reply = json.loads(line)
+    except ValueError as e:
+        raise DaemonUnavailable("Malformed reply from daemon") from e
+    if not reply.get("ok"):
+        raise DaemonUnavailable(reply.get("error", "Daemon error"))
+    return reply["result"]
+
+
+def dispatch(op, use_daemon=True, trace=None, **args):
+    """Run an operation on the daemon if one is running, else in-process.
+
+    Requests that write files always run in-process. If a trace dict is given,
+    its "route" is set to "daemon" or "local".
+    """
+    trace = trace if trace is not None else {}
+    if use_daemon and not _writes_files(op, args):
+        try:
+            result = request(op, **args)
+            trace["route"] = "daemon"
+            return result
+        except DaemonUnavailable:
+            pass
+    trace["route"] = "local"
+    return execute(op, args)
@@ -14,11 +14,15 @@ Usage:
 """
 
 import csv
+import hashlib
 import json
 import os
+import re
+import stat
+import uuid
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_many, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -31,14 +35,24 @@ SEARCH_CONFIG = {
     "landing": {"max_results": 2},
     "typography": {"max_results": 2}
 }
+DESIGN_SYSTEM_SEARCH_WORKERS = min(len(SEARCH_CONFIG), os.cpu_count() or 1)  # Domains searched concurrently per design system
 
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
-    def __init__(self):
-        self.reasoning_data = self._load_reasoning()
+    def __init__(self, search_workers: int = DESIGN_SYSTEM_SEARCH_WORKERS):
+        self.search_workers = search_workers
+        self._reasoning_data = None
+        self._reasoning_index = None
+
+    @property
+    def reasoning_data(self) -> list:
+        """Reasoning rules, loaded from CSV on first use."""
+        if self._reasoning_data is None:
+            self._reasoning_data = self._load_reasoning()
+        return self._reasoning_data
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
@@ -48,42 +62,63 @@ class DesignSystemGenerator:
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _build_reasoning_index(self) -> dict:
+        """Build lookup structures for _find_reasoning_rule."""
+        exact = {}
+        keys = []
+        keywords = {}
+        for idx, rule in enumerate(self.reasoning_data):
+            ui_cat = (rule.get("UI_Category") or "").lower()
+            exact.setdefault(ui_cat, rule)
+            keys.append((ui_cat, rule))
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                keywords.setdefault(kw, idx)  # First rule owning the keyword
+        return {"exact": exact, "keys": keys, "keywords": keywords, "cache": {}}
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, skip: tuple = ()) -> dict:
+        """Execute searches across multiple domains in a single batch.
+
+        Domains are searched concurrently with up to self.search_workers
+        workers (processes compile cold indexes, threads rank); results keep
+        SEARCH_CONFIG order.
+        """
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
+            if domain in skip:
+                continue
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((f"{query} {priority_query}", domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                requests.append((query, domain, config["max_results"]))
+        responses = search_many(requests, workers=self.search_workers)
+        return {domain: response for (_, domain, _), response in zip(requests, responses)}
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
+        if self._reasoning_index is None:
+            self._reasoning_index = self._build_reasoning_index()
+        index = self._reasoning_index
         category_lower = category.lower()
 
+        if category_lower in index["cache"]:
+            return index["cache"][category_lower]
+
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
+        rule = index["exact"].get(category_lower)
 
         # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
+        if rule is None:
+            rule = next((r for ui_cat, r in index["keys"] if ui_cat in category_lower or category_lower in ui_cat), None)
 
-        return {}
+        # Try keyword match (earliest rule with any keyword inside the category)
+        if rule is None:
+            matches = [idx for kw, idx in index["keywords"].items() if kw in category_lower]
+            rule = self.reasoning_data[min(matches)] if matches else {}
+
+        index["cache"][category_lower] = rule
+        return rule
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -153,8 +188,8 @@ class DesignSystemGenerator:
                     score += 1
             scored.append((score, result))
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored[0][1] if scored and scored[0][0] > 0 else results[0]
+        best_score, best = max(scored, key=lambda x: x[0])
+        return best if best_score > 0 else results[0]
 
     def _extract_results(self, search_result: dict) -> list:
         """Extract results list from search result dict."""
@@ -174,7 +209,7 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
+        search_results = self._multi_domain_search(query, style_priority, skip=("product",))
         search_results["product"] = product_result  # Reuse product search
 
         # Step 4: Select best matches from each domain using priority
@@ -460,7 +495,8 @@ def format_markdown(design_system: dict) -> str:
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           pages: list = None, persist_result: dict = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,6 +507,8 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        pages: Optional list of page names (or (name, query) pairs) to persist in the same run
+        persist_result: Optional dict updated with the persist_design_system() report
 
     Returns:
         Formatted design system string
@@ -480,15 +518,38 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persisted = persist_design_system(design_system, page, output_dir, query, pages=pages)
+        if persist_result is not None:
+            persist_result.update(persisted)
 
     if output_format == "markdown":
         return format_markdown(design_system)
     return format_ascii_box(design_system)
 
 
+def load_pages_manifest(path: str) -> list:
+    """
+    Read a pages manifest: one page per line, optionally "page: page-specific query".
+    Blank lines and lines starting with # are ignored.
+    """
+    pages = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, query = line.partition(":")
+            pages.append((name.strip(), query.strip() or None))
+    return pages
+
+
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+MANIFEST_FILE = ".manifest.json"
+_TIMESTAMP_RE = re.compile(r"(\*\*Generated:\*\* )\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -497,9 +558,16 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of page names, or (name, query) pairs, to write alongside `page`.
+               MASTER.md is written once and all overrides share the warm search indexes.
+    
+    Files are only rewritten when their content (ignoring the Generated timestamp)
+    changed since the last run, tracked in design-system/<project>/.manifest.json.
+    Writes are atomic (temp file + rename).
     
     Returns:
-        dict with created file paths and status
+        dict with status, all target file paths ("created_files") and per-file
+        outcome lists under "created", "updated" and "unchanged"
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
@@ -511,34 +579,123 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     pages_dir = design_system_dir / "pages"
     
     created_files = []
+    outcomes = {"created": [], "updated": [], "unchanged": []}
     
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
     
+    manifest_file = design_system_dir / MANIFEST_FILE
+    manifest = _load_manifest(manifest_file)
+    
     master_file = design_system_dir / "MASTER.md"
+    targets = [(master_file, format_master_md(design_system))]
+    
+    # Page override files with intelligent content
+    page_specs = _page_specs(page, pages, page_query)
+    for page_name, page_content in _build_page_overrides(design_system, page_specs):
+        targets.append((pages_dir / f"{_page_slug(page_name)}.md", page_content))
     
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
+    for path, content in targets:
+        outcome = _write_if_changed(path, content, manifest, path.relative_to(design_system_dir).as_posix())
+        outcomes[outcome].append(str(path))
+        created_files.append(str(path))
     
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+    if outcomes["created"] or outcomes["updated"]:
+        _atomic_write(manifest_file, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        **outcomes
     }
 
 
+def _content_hash(content: str) -> str:
+    """Hash of a generated file, ignoring its Generated timestamp."""
+    return hashlib.sha256(_TIMESTAMP_RE.sub(r"\1", content).encode('utf-8')).hexdigest()
+
+
+def _load_manifest(path: Path) -> dict:
+    """Read the persistence manifest (relative path -> hash and file stat)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _atomic_write(path: Path, content: str):
+    """Write a file via a temp file in the same directory and an atomic rename.
+
+    The file keeps the mode of the one it replaces; new files get the usual
+    0o666 & ~umask (mkstemp would leave them 0600).
+    """
+    tmp = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _write_if_changed(path: Path, content: str, manifest: dict, key: str) -> str:
+    """
+    Write content unless the file is already up to date; returns "created", "updated" or "unchanged".
+    A file counts as up to date when the manifest hash matches and the file on disk is
+    still the one we wrote (same size and mtime), so manual edits get regenerated.
+    """
+    digest = _content_hash(content)
+    entry = manifest.get(key, {})
+    exists = path.exists()
+    if exists and entry.get("hash") == digest:
+        info = path.stat()
+        if entry.get("signature") == [info.st_mtime_ns, info.st_size]:
+            return "unchanged"
+    
+    _atomic_write(path, content)
+    info = path.stat()
+    manifest[key] = {"hash": digest, "signature": [info.st_mtime_ns, info.st_size]}
+    return "updated" if exists else "created"
+
+
+def _page_slug(name: str) -> str:
+    """File name (without .md) of a page override."""
+    return name.lower().replace(' ', '-')
+
+
+def _page_specs(page: str, pages: list, default_query: str) -> list:
+    """Normalise page arguments to (name, query) pairs with unique file names, in order."""
+    specs = []
+    seen = set()
+    for entry in ([page] if page else []) + list(pages or []):
+        name, query = entry if isinstance(entry, (list, tuple)) else (entry, None)
+        name = name.strip()
+        if name and _page_slug(name) not in seen:
+            seen.add(_page_slug(name))
+            specs.append((name, query or default_query))
+    return specs
+
+
+def _build_page_overrides(design_system: dict, page_specs: list) -> list:
+    """Build (name, markdown) for each page; searches for all pages run in one batch first."""
+    if not page_specs:
+        return []
+
+    # One batched pass warms the indexes and the result cache for every page
+    search_many([req for name, query in page_specs for req in _page_search_requests(_page_context(name, query))])
+    return [(name, format_page_override_md(design_system, name, query)) for name, query in page_specs]
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -911,6 +1068,20 @@ def format_page_override_md(design_system: dict, page_name: str, page_query: str
     return "\n".join(lines)
 
 
+def _page_context(page_name: str, page_query: str) -> str:
+    """Search context for a page override."""
+    return f"{page_name.lower()} {(page_query or '').lower()}"
+
+
+def _page_search_requests(context: str) -> list:
+    """search_many() requests behind a page override: style, ux and landing guidance."""
+    return [
+        (context, "style", 1),
+        (context, "ux", 3),
+        (context, "landing", 1)
+    ]
+
+
 def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
     """
     Generate intelligent overrides based on page type using layered search.
@@ -918,16 +1089,10 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
+    combined_context = _page_context(page_name, page_query)
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search, ux_search, landing_search = search_many(_page_search_requests(combined_context))
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmarks - timing and memory for search and design-system generation
+
+Usage (from the skill directory, fully offline):
+    python -m benchmarks                          # 1x, 10x and 100x corpora
+    python -m benchmarks --scales 1,10 --repeat 5
+    python -m benchmarks --output after.json --compare before.json
+
+Each scale copies the shipped CSVs into a temporary data directory with every
+row repeated N times. Per scale it reports, in milliseconds (median of
+--repeat runs) plus the tracemalloc peak of one extra run:
+    bm25_fit / bm25_score            BM25 on the raw documents of every domain
+    search_* / search_stack_* /      the fixed query sets below, run
+    design_system_*                  cold  (no in-memory or on-disk index),
+                                     disk  (compiled index on disk only),
+                                     warm  (indexes in memory, result cache empty)
+"""
+
+import csv
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import core
+import design_system
+from core import BM25, CSV_CONFIG, DATA_DIR, search, search_stack
+from design_system import generate_design_system
+
+# ============ CONFIGURATION ============
+SCALES = [1, 10, 100]
+REPEAT = 3
+
+QUERIES = {
+    "style": ["glassmorphism dark mode", "minimal clean swiss", "playful colorful kids"],
+    "color": ["fintech banking trust", "luxury beauty spa", "healthcare calm"],
+    "chart": ["trend over time", "compare categories bar", "funnel conversion"],
+    "landing": ["hero pricing conversion", "testimonial social proof", "saas signup"],
+    "product": ["saas dashboard", "ecommerce luxury", "crypto exchange"],
+    "ux": ["accessibility keyboard focus", "touch target mobile", "scroll animation"],
+    "typography": ["serif elegant heading", "modern tech sans", "playful rounded"],
+    "icons": ["icon lucide", "navigation arrow", "social share"],
+    "react": ["memo rerender", "bundle barrel import", "suspense waterfall"],
+    "web": ["form input autocomplete", "aria label focus", "preconnect fonts"]
+}
+STACK_QUERIES = {
+    "html-tailwind": ["responsive grid layout", "dark mode toggle"],
+    "react": ["state management hooks", "list rendering keys"],
+    "nextjs": ["image optimization", "server components data fetching"],
+    "flutter": ["state management", "navigation routing"]
+}
+DESIGN_SYSTEM_QUERIES = ["SaaS dashboard", "luxury e-commerce", "fintech banking app", "wellness spa booking"]
+
+
+# ============ SYNTHETIC CORPORA ============
+def build_corpus(scale, target):
+    """Copy every shipped CSV into target with each row repeated `scale` times; returns the row count"""
+    total = 0
+    for source in DATA_DIR.rglob("*.csv"):
+        if ".cache" in source.parts:
+            continue
+        dest = target / source.relative_to(DATA_DIR)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        with open(dest, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(rows[0])
+            for _ in range(scale):
+                writer.writerows(rows[1:])
+            total += scale * (len(rows) - 1)
+    return total
+
+
+def use_data_dir(data_dir, keep_disk=True):
+    """Point the search modules at data_dir and drop in-memory caches (and the disk index unless keep_disk)"""
+    core.DATA_DIR = design_system.DATA_DIR = data_dir
+    core.INDEX_DIR = data_dir / ".cache"
+    for cache in (core._INDEXES, core._SCORERS, core._UNIFIED, core._SIMILARITY):
+        cache.clear()
+    core.RESULT_CACHE.clear()
+    del core.LOAD_TIMINGS[:]
+    if not keep_disk:
+        shutil.rmtree(core.INDEX_DIR, ignore_errors=True)
+
+
+# ============ MEASUREMENT ============
+def measure(fn, repeat, setup=None):
+    """Median/min wall time over `repeat` runs, plus the tracemalloc peak of one more run"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "runs": repeat,
+        "peak_kb": round(peak / 1024, 1)
+    }
+
+
+def _run_searches():
+    for domain, queries in QUERIES.items():
+        for query in queries:
+            search(query, domain)
+
+
+def _run_stack_searches():
+    for stack, queries in STACK_QUERIES.items():
+        for query in queries:
+            search_stack(query, stack)
+
+
+def _run_design_systems():
+    for query in DESIGN_SYSTEM_QUERIES:
+        generate_design_system(query, "Benchmark")
+
+
+def _domain_documents(data_dir):
+    """Raw BM25 documents for every domain CSV under data_dir"""
+    documents = {}
+    for domain, config in CSV_CONFIG.items():
+        filepath = data_dir / config["file"]
+        if filepath.exists():
+            rows = core._stream_csv(filepath, config["search_cols"])
+            documents[domain] = [" ".join(str(row[col]) for col in config["search_cols"]) for _, row in rows]
+    return documents
+
+
+def bench_scale(scale, repeat, workdir):
+    """Run every benchmark against a corpus `scale` times the shipped data"""
+    data_dir = workdir / f"{scale}x"
+    results = {"rows": build_corpus(scale, data_dir)}
+
+    documents = _domain_documents(data_dir)
+    fitted = {}
+
+    def fit():
+        for domain, docs in documents.items():
+            fitted[domain] = BM25()
+            fitted[domain].fit(docs)
+
+    def score():
+        for domain, queries in QUERIES.items():
+            for query in queries:
+                fitted[domain].score(query)
+
+    results["bm25_fit"] = measure(fit, repeat)
+    results["bm25_score"] = measure(score, repeat)
+
+    for name, fn in (("search", _run_searches), ("search_stack", _run_stack_searches),
+                     ("design_system", _run_design_systems)):
+        # Cold rebuilds every index, so it runs once rather than `repeat` times
+        results[f"{name}_cold"] = measure(fn, 1, lambda: use_data_dir(data_dir, keep_disk=False))
+        results[f"{name}_disk"] = measure(fn, repeat, lambda: use_data_dir(data_dir))
+        fn()
+        results[f"{name}_warm"] = measure(fn, repeat, core.RESULT_CACHE.clear)
+    return results
+
+
+def run(scales=SCALES, repeat=REPEAT, progress=None):
+    """Benchmark every scale; returns a JSON-serialisable report"""
+    original = core.DATA_DIR
+    workdir = Path(tempfile.mkdtemp(prefix="ui-ux-pro-max-bench-"))
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat
+        },
+        "scales": {}
+    }
+    try:
+        for scale in scales:
+            if progress:
+                progress(f"Benchmarking {scale}x corpus...")
+            report["scales"][f"{scale}x"] = bench_scale(scale, repeat, workdir)
+    finally:
+        use_data_dir(original)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def compare(before, after):
+    """Lines of 'scale metric: before -> after (ratio)' for metrics present in both reports"""
+    lines = []
+    for scale, metrics in after["scales"].items():
+        for metric, value in metrics.items():
+            old = before.get("scales", {}).get(scale, {}).get(metric)
+            if not isinstance(value, dict) or not isinstance(old, dict) or not old["ms"]:
+                continue
+            lines.append(f"{scale:>5} {metric:<20} {old['ms']:>10.2f} -> {value['ms']:>10.2f} ms  ({value['ms'] / old['ms']:.2f}x)")
+    return lines
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="UI Pro Max search benchmarks")
+    parser.add_argument("--scales", type=str, default=",".join(map(str, SCALES)), help="Comma-separated corpus scales (default: 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"Timed runs per warm measurement (default: {REPEAT})")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", type=str, default=None, help="Earlier JSON report to compare against (summary on stderr)")
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    report = run(scales, args.repeat, progress=lambda message: print(message, file=sys.stderr))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding='utf-8')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            before = json.load(f)
+        print("\n".join(compare(before, report)), file=sys.stderr)
+    return 0
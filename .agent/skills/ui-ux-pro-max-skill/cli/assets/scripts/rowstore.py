@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Row Store - CSV rows packed into a binary file and read through mmap
+
+Processes map the same file, so concurrent agents share its pages through the
+OS cache instead of each holding every row as Python strings. Cells are
+decoded only when asked for.
+
+Layout (little-endian):
+    header   magic, format version, rows, columns, strings (u32 each),
+             source mtime_ns and size (u64 each)
+    columns  one u32 string id per CSV header column
+    cells    rows * columns u32 string ids, row-major (MISSING for absent cells)
+    offsets  strings + 1 u64 offsets into the string data
+    strings  UTF-8 data, each distinct value stored once
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"UXRS"
+FORMAT_VERSION = 1
+MISSING = 0xFFFFFFFF
+_HEADER = struct.Struct("<4sIIIIQQ")
+_U32 = struct.Struct("<I")
+_OFFSETS = struct.Struct("<QQ")
+
+
+def _little_endian(values):
+    """Bytes of an array in little-endian order"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_store(path, header, rows, signature):
+    """Pack rows (value lists aligned with header, None for absent cells) into path atomically.
+
+    signature is the source file's [mtime_ns, size], checked by open_store().
+    """
+    import tempfile
+    ids, strings = {}, []
+
+    def intern(value):
+        string_id = ids.get(value)
+        if string_id is None:
+            string_id = ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    column_ids = array('I', [intern(col) for col in header])
+    cells = array('I')
+    n_rows = 0
+    for row in rows:
+        cells.extend(MISSING if value is None else intern(value) for value in row)
+        n_rows += 1
+
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = array('Q', [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, n_rows, len(header), len(strings), *signature))
+            f.write(_little_endian(column_ids))
+            f.write(_little_endian(cells))
+            f.write(_little_endian(offsets))
+            f.write(b"".join(encoded))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class RowStore:
+    """Read-only view of a packed row file"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n_rows, self.n_cols, n_strings, mtime_ns, size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a row store: {path}")
+        self.signature = [mtime_ns, size]
+        self._columns_at = _HEADER.size
+        self._cells_at = self._columns_at + 4 * self.n_cols
+        self._offsets_at = self._cells_at + 4 * self.n_rows * self.n_cols
+        self._strings_at = self._offsets_at + 8 * (n_strings + 1)
+        self.header = [self._string(_U32.unpack_from(self._mm, self._columns_at + 4 * col)[0])
+                       for col in range(self.n_cols)]
+
+    def __len__(self):
+        return self.n_rows
+
+    def _string(self, string_id):
+        if string_id == MISSING:
+            return None
+        start, end = _OFFSETS.unpack_from(self._mm, self._offsets_at + 8 * string_id)
+        return self._mm[self._strings_at + start:self._strings_at + end].decode('utf-8')
+
+    def value(self, row, col):
+        """Decode one cell (None if the CSV row was short)"""
+        if not 0 <= row < self.n_rows:
+            raise IndexError(row)
+        return self._string(_U32.unpack_from(self._mm, self._cells_at + 4 * (row * self.n_cols + col))[0])
+
+    def row(self, row):
+        """Decode every cell of a row"""
+        return [self.value(row, col) for col in range(self.n_cols)]
+
+    def close(self):
+        self._mm.close()
+
+
+def open_store(path, signature):
+    """Open a row store if it exists and was packed from a source with this signature, else None"""
+    try:
+        store = RowStore(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if store.signature != list(signature):
+        store.close()
+        return None
+    return store
@@ -4,21 +4,40 @@
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
+       python search.py --similar <row> [--domain <domain> | --stack <stack>] [--similar-in "color,typography"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages "home,checkout,settings"
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
+         all (rank every domain and stack together with the unified BM25F index)
 Stacks: html-tailwind, react, nextjs
 
+More like this:
+  --similar     Rows most similar to row N (0-based) of --domain/--stack (default: style)
+  --similar-in  Comma-separated domains to find them in instead, e.g. "color,typography"
+
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      Comma-separated pages, all written in one run (MASTER.md generated once)
+  --pages-file Pages manifest: one page per line, optionally "page: page-specific query"
+
+Daemon (warm indexes, no per-call startup cost):
+  --serve        Run the search daemon; later calls use it automatically
+  --stop-server  Stop a running daemon
+  --no-daemon    Always search in-process
 """
 
+import time
+_START = time.perf_counter()
+
 import argparse
+import os
 import sys
 import io
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+from core import CSV_CONFIG, AVAILABLE_STACKS, AVAILABLE_BACKENDS, MAX_RESULTS, LOAD_TIMINGS
+from daemon import DaemonUnavailable, dispatch, request, serve
+_IMPORTED = time.perf_counter()
 
 # Force UTF-8 for stdout/stderr to handle emojis on Windows (cp1252 default)
 if sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
@@ -53,13 +72,35 @@ def format_output(result):
     return "\n".join(output)
 
 
+def format_cache_stats(stats):
+    """Format result cache counters"""
+    return (f"## Result Cache\n"
+            f"- **Hits:** {stats['hits']} | **Misses:** {stats['misses']} | **Evictions:** {stats['evictions']}\n"
+            f"- **Hit rate:** {stats['hit_rate']:.1%} | **Size:** {stats['size']}/{stats['maxsize']}")
+
+
+def format_startup_profile(trace, request_start, request_end):
+    """Format import/load timings collected during this run"""
+    ms = lambda seconds: f"{seconds * 1000:.1f} ms"
+    lines = ["## Startup Profile"]
+    lines.append(f"- **Imports:** {ms(_IMPORTED - _START)}")
+    for name, source, seconds in LOAD_TIMINGS:
+        lines.append(f"- **Load {name}** ({source}): {ms(seconds)}")
+    lines.append(f"- **Request** ({trace.get('route', 'local')}): {ms(request_end - request_start)}")
+    lines.append(f"- **Total (after interpreter start):** {ms(request_end - _START)}")
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
-    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()) + ["all"], help="Search domain ('all' ranks across every domain and stack)")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--backend", choices=AVAILABLE_BACKENDS, default=None, help="Scoring backend (numpy falls back to python if NumPy is missing)")
+    parser.add_argument("--similar", type=int, default=None, metavar="ROW", help="Find rows similar to this row (0-based) of --domain/--stack")
+    parser.add_argument("--similar-in", type=str, default=None, help="Comma-separated domains to search for similar rows (default: same domain)")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
@@ -67,38 +108,93 @@ if __name__ == "__main__":
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="Comma-separated page names to create override files for in one run")
+    parser.add_argument("--pages-file", type=str, default=None, help="Pages manifest file (one page per line, optional 'page: query')")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Daemon
+    parser.add_argument("--serve", action="store_true", help="Run a search daemon that keeps indexes warm")
+    parser.add_argument("--stop-server", action="store_true", help="Stop a running search daemon")
+    parser.add_argument("--no-daemon", action="store_true", help="Do not use a running daemon")
+    parser.add_argument("--profile-startup", action="store_true", help="Report import and data load timings to stderr")
+    parser.add_argument("--cache-stats", action="store_true", help="Report result cache hits/misses/evictions (of the daemon, if running) to stderr")
 
     args = parser.parse_args()
+    use_daemon = not args.no_daemon
+    trace = {}
+    request_start = time.perf_counter()
+
+    if args.serve:
+        sys.exit(serve())
+    if args.stop_server:
+        try:
+            request("shutdown")
+            print("Search daemon stopped")
+        except DaemonUnavailable:
+            print("No search daemon running")
+        sys.exit(0)
+    if args.query is None and args.similar is None:
+        if args.cache_stats:
+            print(format_cache_stats(dispatch("cache_stats", use_daemon, trace)), file=sys.stderr)
+            sys.exit(0)
+        parser.error("the following arguments are required: query")
 
     # Design system takes priority
-    if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
+    if args.similar is not None:
+        label = f"stack:{args.stack}" if args.stack else (args.domain or "style")
+        domains = [name.strip() for name in args.similar_in.split(",") if name.strip()] if args.similar_in else None
+        result = dispatch("similar", use_daemon, trace, domain=label, row_id=args.similar, k=args.max_results, domains=domains)
+        if args.json:
+            import json
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
+    elif args.design_system:
+        pages = [name.strip() for name in args.pages.split(",") if name.strip()] if args.pages else []
+        if args.pages_file:
+            from design_system import load_pages_manifest
+            pages += load_pages_manifest(args.pages_file)
+        result = dispatch(
+            "design_system",
+            use_daemon,
+            trace,
+            query=args.query,
+            project_name=args.project_name,
+            output_format=args.format,
             persist=args.persist,
             page=args.page,
-            output_dir=args.output_dir
+            output_dir=os.path.abspath(args.output_dir or os.getcwd()),
+            pages=pages
         )
-        print(result)
+        print(result["output"])
         
         # Print persistence confirmation
         if args.persist:
-            project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
+            persisted = result["persist"]
+            design_system_dir = persisted["design_system_dir"]
+            project_slug = os.path.basename(design_system_dir)
+            base_dir = os.path.dirname(os.path.dirname(design_system_dir))
+            outcome = {path: status for status in ("created", "updated", "unchanged") for path in persisted[status]}
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            for path in persisted["created_files"]:
+                label = "Global Source of Truth" if os.path.basename(path) == "MASTER.md" else "Page Overrides"
+                print(f"   📄 {os.path.relpath(path, base_dir)} ({label}) [{outcome[path]}]")
+            print(f"   Created: {len(persisted['created'])} | Updated: {len(persisted['updated'])} | Unchanged: {len(persisted['unchanged'])}")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
             print("=" * 60)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = dispatch("search_stack", use_daemon, trace, query=args.query, stack=args.stack, max_results=args.max_results, backend=args.backend)
+        if args.json:
+            import json
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
+    # Cross-domain search
+    elif args.domain == "all":
+        result = dispatch("search_all", use_daemon, trace, query=args.query, max_results=args.max_results)
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -106,9 +202,14 @@ if __name__ == "__main__":
             print(format_output(result))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = dispatch("search", use_daemon, trace, query=args.query, domain=args.domain, max_results=args.max_results, backend=args.backend)
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
+
+    if args.cache_stats:
+        print(format_cache_stats(dispatch("cache_stats", use_daemon)), file=sys.stderr)
+    if args.profile_startup:
+        print(format_startup_profile(trace, request_start, time.perf_counter()), file=sys.stderr)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Tokenizer - text normalisation and a shared token vocabulary
+
+Every index in a process interns its terms in VOCAB, so documents and postings
+are stored as compact integer arrays and scoring compares ints, not strings.
+
+Tokenizers (selected per index by name, see TOKENIZERS):
+    latin  words of 3+ characters
+    cjk    latin words plus overlapping character bigrams for CJK runs, so
+           Chinese/Japanese/Korean text (written without spaces) is searchable;
+           Chinese UI terms listed in ZH_TERMS also yield their English tokens
+
+The shipped CSVs are English only, so a Chinese query finds rows through
+ZH_TERMS alone: terms missing from it match nothing. Changing ZH_TERMS changes
+"cjk" tokens, so bump core.INDEX_VERSION with it.
+"""
+
+import re
+import threading
+from array import array
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_CJK_RUN = re.compile(r'([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+)')
+MIN_TOKEN_LENGTH = 3
+DEFAULT_TOKENIZER = "cjk"
+
+# Chinese UI vocabulary -> English terms used in the data
+ZH_TERMS = {
+    # Styles and moods
+    "风格": "style", "设计": "design", "极简": "minimalism", "简约": "minimal", "简洁": "clean",
+    "玻璃拟态": "glassmorphism", "毛玻璃": "glassmorphism", "新拟态": "neumorphism", "野兽派": "brutalism",
+    "扁平": "flat", "极光": "aurora", "渐变": "gradient", "阴影": "shadow", "现代": "modern",
+    "专业": "professional", "优雅": "elegant", "高端": "luxury", "奢华": "luxury", "复古": "retro",
+    "科技": "tech", "未来": "futuristic", "活泼": "playful", "可爱": "playful",
+    "深色模式": "dark mode", "暗黑模式": "dark mode", "深色": "dark", "暗色": "dark", "浅色": "light", "亮色": "light",
+    # Colour and typography
+    "颜色": "color", "配色": "color palette", "色板": "palette", "调色板": "palette",
+    "字体": "font", "排版": "typography", "标题": "heading", "无衬线": "sans", "衬线": "serif",
+    # Charts
+    "图表": "chart", "折线图": "line chart", "柱状图": "bar chart", "饼图": "pie chart", "散点图": "scatter",
+    "热力图": "heatmap", "漏斗": "funnel", "趋势": "trend", "可视化": "visualization",
+    # Pages and sections
+    "落地页": "landing", "着陆页": "landing", "首屏": "hero", "定价": "pricing", "价格": "pricing",
+    "用户评价": "testimonial", "转化": "conversion", "行动号召": "cta",
+    # Products
+    "仪表盘": "dashboard", "仪表板": "dashboard", "看板": "dashboard", "后台": "admin dashboard",
+    "电商": "ecommerce e-commerce", "购物车": "cart", "结算": "checkout", "支付": "payment", "金融": "fintech",
+    "医疗": "healthcare", "游戏": "gaming", "作品集": "portfolio", "加密货币": "crypto", "教育": "education",
+    "社交": "social", "聊天": "chat", "音乐": "music", "旅游": "travel", "餐厅": "restaurant", "健身": "fitness",
+    # UX and components
+    "可访问性": "accessibility", "无障碍": "accessibility", "可用性": "usability", "动画": "animation",
+    "导航": "navigation", "移动端": "mobile", "手机": "mobile", "响应式": "responsive", "滚动": "scroll",
+    "键盘": "keyboard", "触摸": "touch", "图标": "icon", "按钮": "button", "表单": "form", "输入框": "input",
+    "卡片": "card", "弹窗": "modal", "模态框": "modal", "侧边栏": "sidebar", "表格": "table",
+    "登录": "login", "注册": "signup",
+}
+# Longest first, so "深色模式" wins over "深色"
+_ZH_TERM = re.compile("|".join(sorted(map(re.escape, ZH_TERMS), key=lambda term: (-len(term), term))))
+
+
+def tokenize(text):
+    """Lowercase, split, remove punctuation, filter short words"""
+    return [w for w in _NON_WORD.sub(' ', str(text).lower()).split() if len(w) >= MIN_TOKEN_LENGTH]
+
+
+def tokenize_cjk(text):
+    """tokenize(), with CJK runs split out and indexed as character bigrams.
+
+    Each run is followed by the English tokens of the ZH_TERMS it contains.
+    Text without CJK characters yields exactly the same tokens as tokenize().
+    """
+    tokens = []
+    parts = _CJK_RUN.split(_NON_WORD.sub(' ', str(text).lower()))
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            tokens.extend(w for w in part.split() if len(w) >= MIN_TOKEN_LENGTH)
+        elif len(part) == 1:  # Captured CJK run: unigram if alone, else bigrams
+            tokens.append(part)
+        else:
+            tokens.extend(part[j:j + 2] for j in range(len(part) - 1))
+        if i % 2:
+            for match in _ZH_TERM.finditer(part):
+                tokens.extend(tokenize(ZH_TERMS[match.group()]))
+    return tokens
+
+
+TOKENIZERS = {
+    "latin": tokenize,
+    "cjk": tokenize_cjk
+}
+
+
+def get_tokenizer(name=None):
+    """Resolve a tokenizer name (default: DEFAULT_TOKENIZER) to its function"""
+    name = name or DEFAULT_TOKENIZER
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer: {name}. Available: {', '.join(TOKENIZERS)}")
+    return TOKENIZERS[name]
+
+
+class Vocabulary:
+    """Bidirectional token <-> integer id mapping, safe to intern into from several threads"""
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, token):
+        """Return the id of a token, interning it if new"""
+        token_id = self.ids.get(token)
+        if token_id is None:
+            with self._lock:
+                token_id = self.ids.get(token)
+                if token_id is None:  # Publish the id only once its term is in place
+                    self.terms.append(token)
+                    token_id = self.ids[token] = len(self.terms) - 1
+        return token_id
+
+    def get(self, token):
+        """Return the id of a known token, or None"""
+        return self.ids.get(token)
+
+    def encode(self, tokens):
+        """Intern tokens and return them as an array('I') of ids"""
+        return array('I', [self.add(token) for token in tokens])
+
+    def lookup(self, tokens):
+        """Ids of the known tokens, in order; unknown tokens are dropped"""
+        ids = self.ids
+        return [ids[token] for token in tokens if token in ids]
+
+
+# Shared by all indexes loaded in this process
+VOCAB = Vocabulary()
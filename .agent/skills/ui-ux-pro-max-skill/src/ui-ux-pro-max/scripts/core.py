@@ -5,14 +5,33 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import json
+import os
 import re
+import threading
+import time
+import zlib
+from array import array
 from pathlib import Path
-from math import log
-from collections import defaultdict
+from math import log, sqrt
+from collections import OrderedDict, defaultdict
+
+import rowstore
+from tokenizer import DEFAULT_TOKENIZER, VOCAB, get_tokenizer
+
+# NumPy is imported on first use by the "numpy" backend (see numpy_available);
+# hashlib/tempfile are only imported when an index has to be (re)built.
+np = None
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = DATA_DIR / ".cache"
+INDEX_VERSION = 7
 MAX_RESULTS = 3
+DEFAULT_BACKEND = "python"
+RESULT_CACHE_SIZE = 512
+SEARCH_WORKERS = 1  # Domains search_many() ranks concurrently; 1 = sequential
 
 CSV_CONFIG = {
     "style": {
@@ -83,6 +102,14 @@ STACK_CONFIG = {
     "jetpack-compose": {"file": "stacks/jetpack-compose.csv"}
 }
 
+# Every index uses DEFAULT_TOKENIZER ("cjk": identical to "latin" on Latin text,
+# plus bigrams for Chinese/Japanese/Korean and English tokens for known Chinese
+# terms) unless its config sets "tokenizer".
+def _tokenizer_for(config):
+    """Tokenizer name configured for a CSV_CONFIG / STACK_CONFIG entry"""
+    return config.get("tokenizer", DEFAULT_TOKENIZER)
+
+
 # Common columns for all stacks
 _STACK_COLS = {
     "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
@@ -90,149 +117,1144 @@ _STACK_COLS = {
 }
 
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
+AVAILABLE_BACKENDS = ["python", "numpy"]
+
+# BM25F weights of search columns in the unified cross-domain index
+# (names and categories count more than long keyword/prompt blobs)
+FIELD_WEIGHTS = {
+    "Style Category": 3.0, "Product Type": 3.0, "Pattern Name": 3.0, "Font Pairing Name": 3.0,
+    "Icon Name": 3.0, "Data Type": 3.0, "Guideline": 2.5, "Issue": 2.5,
+    "Category": 2.0, "Keywords": 2.0, "Mood/Style Keywords": 2.0, "Best Chart Type": 2.0,
+    "Best For": 1.5, "Type": 1.5, "Heading Font": 1.5, "Body Font": 1.5,
+    "AI Prompt Keywords": 0.5, "Section Order": 0.5, "Accessibility Notes": 0.5
+}
+DEFAULT_FIELD_WEIGHT = 1.0
+DOMAIN_FIELD_WEIGHT = 2.0  # Domain name / file name, e.g. "color colors", "stack flutter"
+SIMILAR_NEIGHBOURS = 10  # Same-domain neighbours precomputed per row for similar()
 
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search.
 
-    def __init__(self, k1=1.5, b=0.75):
+    Terms are interned in a shared Vocabulary: documents are array('I') of
+    token ids and postings map term id -> (doc ids, term frequencies).
+    The tokenizer is chosen by name from tokenizer.TOKENIZERS.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, vocab=None, tokenizer=None):
         self.k1 = k1
         self.b = b
+        self.vocab = vocab if vocab is not None else VOCAB
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self._tokenize = get_tokenizer(self.tokenizer)
         self.corpus = []
         self.doc_lengths = []
+        self.doc_norms = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
         self.N = 0
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Split text into index terms with this index's tokenizer"""
+        return self._tokenize(text)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
+        self.corpus = [self.vocab.encode(self.tokenize(doc)) for doc in documents]
         self.N = len(self.corpus)
         if self.N == 0:
             return
         self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        # Inverted index: term id -> (doc ids, tfs), doc ids ascending
+        postings = defaultdict(lambda: (array('I'), array('I')))
+        for idx, doc in enumerate(self.corpus):
+            term_freqs = defaultdict(int)
+            for term_id in doc:
+                term_freqs[term_id] += 1
+            for term_id, tf in term_freqs.items():
+                docs, tfs = postings[term_id]
+                docs.append(idx)
+                tfs.append(tf)
+        self.postings = dict(postings)
+
+        for term_id, (docs, _) in self.postings.items():
+            self.doc_freqs[term_id] = len(docs)
+
+        for term_id, freq in self.doc_freqs.items():
+            self.idf[term_id] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+
+        self._compute_norms()
 
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+    def _compute_norms(self):
+        """Precompute the length normalisation term of each document"""
+        self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+
+    def _query_ids(self, query):
+        """Vocabulary ids of the query tokens (unknown tokens cannot match)"""
+        return self.vocab.lookup(self.tokenize(query))
+
+    def _accumulate(self, query_ids):
+        """Sum BM25 contributions over the postings of each query term"""
+        scores = {}
+        k1_plus_1 = self.k1 + 1
+        norms = self.doc_norms
+        for term_id in query_ids:
+            plist = self.postings.get(term_id)
+            if not plist:
+                continue
+            idf = self.idf[term_id]
+            for idx, tf in zip(*plist):
+                scores[idx] = scores.get(idx, 0) + idf * (tf * k1_plus_1) / (tf + norms[idx])
+        return scores
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+        matched = self._accumulate(self._query_ids(query))
+        scores = [(idx, matched.get(idx, 0)) for idx in range(self.N)]
+        return sorted(scores, key=lambda x: x[1], reverse=True)
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
+    def top_k(self, query, k, min_score=0):
+        """Return the k best (doc_id, score) pairs scoring above min_score"""
+        if k <= 0:
+            return []
+        matched = self._accumulate(self._query_ids(query))
+        candidates = ((idx, score) for idx, score in matched.items() if score > min_score)
+        # Bounded heap; ties keep ascending doc order like score()
+        return heapq.nsmallest(k, candidates, key=lambda x: (-x[1], x[0]))
+
+    def to_dict(self):
+        """Serialize fitted state for the on-disk index (terms as strings)"""
+        terms = self.vocab.terms
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer,
+            "doc_lengths": self.doc_lengths,
+            "avgdl": self.avgdl,
+            "idf": {terms[term_id]: idf for term_id, idf in self.idf.items()},
+            "postings": {terms[term_id]: [docs.tolist(), tfs.tolist()] for term_id, (docs, tfs) in self.postings.items()},
+            "N": self.N
+        }
+
+    @classmethod
+    def from_dict(cls, data, vocab=None):
+        """Restore a fitted instance without re-tokenizing the corpus"""
+        bm25 = cls(data["k1"], data["b"], vocab, data.get("tokenizer"))
+        add = bm25.vocab.add
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.avgdl = data["avgdl"]
+        bm25.idf = {add(term): idf for term, idf in data["idf"].items()}
+        bm25.postings = {add(term): (array('I', docs), array('I', tfs)) for term, (docs, tfs) in data["postings"].items()}
+        bm25.doc_freqs = defaultdict(int, {term_id: len(docs) for term_id, (docs, _) in bm25.postings.items()})
+        bm25.N = data["N"]
+        if bm25.N:
+            bm25._compute_norms()
+        return bm25
+
+
+def numpy_available():
+    """Import NumPy on demand; True if the numpy backend can be used"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+
+class NumpyBM25(BM25):
+    """BM25 with a vectorised NumPy scorer for large corpora.
+
+    Postings are packed term-major (CSC layout: indptr / doc ids / weights)
+    with the full BM25 weight of every (term, doc) pair precomputed, so a
+    query is one sparse mat-vec: a weighted bincount over the postings of
+    its terms. A batch of queries shares a single bincount.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, vocab=None, tokenizer=None):
+        if not numpy_available():
+            raise ImportError("NumpyBM25 requires NumPy")
+        super().__init__(k1, b, vocab, tokenizer)
+        self.term_ids = {}
+        self.indptr = None
+        self.indices = None
+        self.weights = None
+
+    def fit(self, documents):
+        """Build BM25 index and doc-term weight matrix from documents"""
+        super().fit(documents)
+        self._build_matrix()
+
+    @classmethod
+    def from_dict(cls, data, vocab=None):
+        """Restore a fitted instance and pack its weight matrix"""
+        bm25 = super().from_dict(data, vocab)
+        bm25._build_matrix()
+        return bm25
+
+    def _build_matrix(self):
+        """Pack postings into CSC arrays of precomputed BM25 weights"""
+        self.term_ids = {term_id: i for i, term_id in enumerate(self.postings)}
+        lengths = [len(docs) for docs, _ in self.postings.values()]
+        self.indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+
+        nnz = int(self.indptr[-1])
+        self.indices = np.empty(nnz, dtype=np.int64)
+        tfs = np.empty(nnz, dtype=np.float64)
+        idfs = np.empty(nnz, dtype=np.float64)
+        pos = 0
+        for term_id, (docs, term_freqs) in self.postings.items():
+            end = pos + len(docs)
+            self.indices[pos:end] = np.asarray(docs)
+            tfs[pos:end] = np.asarray(term_freqs)
+            idfs[pos:end] = self.idf[term_id]
+            pos = end
+
+        norms = np.asarray(self.doc_norms, dtype=np.float64)
+        self.weights = idfs * (tfs * (self.k1 + 1)) / (tfs + norms[self.indices]) if nnz else tfs
+
+    def _query_postings(self, query_ids):
+        """Slices of the CSC arrays for each indexed query term"""
+        spans = []
+        for term_id in query_ids:
+            col = self.term_ids.get(term_id)
+            if col is not None:
+                spans.append((self.indptr[col], self.indptr[col + 1]))
+        return spans
+
+    def score_batch(self, queries):
+        """Score every document for each query; returns an array (len(queries), N)"""
+        doc_ids, weights = [], []
+        for row, query in enumerate(queries):
+            for start, end in self._query_postings(self._query_ids(query)):
+                doc_ids.append(self.indices[start:end] + row * self.N)
+                weights.append(self.weights[start:end])
+        size = len(queries) * self.N
+        if not doc_ids:
+            return np.zeros((len(queries), self.N))
+        flat = np.bincount(np.concatenate(doc_ids), weights=np.concatenate(weights), minlength=size)
+        return flat.reshape(len(queries), self.N)
+
+    def score(self, query):
+        """Score all documents against query"""
+        scores = self.score_batch([query])[0]
+        return sorted(enumerate(scores.tolist()), key=lambda x: x[1], reverse=True)
+
+    def top_k(self, query, k, min_score=0):
+        """Return the k best (doc_id, score) pairs scoring above min_score"""
+        return self._select(self.score_batch([query])[0], k, min_score)
+
+    def top_k_batch(self, queries, k, min_score=0):
+        """top_k() for several queries scored in one pass"""
+        return [self._select(scores, k, min_score) for scores in self.score_batch(queries)]
+
+    @staticmethod
+    def _select(scores, k, min_score):
+        """Top-k over a score vector, ties in ascending doc order"""
+        if k <= 0:
+            return []
+        candidates = np.flatnonzero(scores > min_score)
+        if len(candidates) > k:
+            keep = np.argpartition(-scores[candidates], k - 1)[:k]
+            threshold = scores[candidates[keep]].min()
+            candidates = candidates[scores[candidates] >= threshold]
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+
+def get_backend(name=None):
+    """Resolve a backend name to a BM25 class, falling back to pure Python"""
+    name = name or DEFAULT_BACKEND
+    if name not in AVAILABLE_BACKENDS:
+        raise ValueError(f"Unknown backend: {name}. Available: {', '.join(AVAILABLE_BACKENDS)}")
+    if name == "numpy" and numpy_available():
+        return NumpyBM25
+    return BM25
+
+
+class BM25F:
+    """BM25F ranking over multi-field documents.
+
+    Each document is a list of (field, weight, text). Term frequencies are
+    length-normalised per field (against that field's average length),
+    weighted, summed, then saturated once per document. Since that is fixed
+    at fit time, postings store the final per-(term, doc) weight and a query
+    is a sum over its terms' postings.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, vocab=None, tokenizer=None):
+        self.k1 = k1
+        self.b = b
+        self.vocab = vocab if vocab is not None else VOCAB
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self._tokenize = get_tokenizer(self.tokenizer)
+        self.postings = {}
+        self.N = 0
+
+    def tokenize(self, text):
+        """Split text into index terms with this index's tokenizer"""
+        return self._tokenize(text)
+
+    def fit(self, documents):
+        """Build the weighted inverted index from multi-field documents"""
+        tokenized = [[(field, weight, self.vocab.encode(self.tokenize(text))) for field, weight, text in doc]
+                     for doc in documents]
+        self.N = len(tokenized)
+
+        totals, counts = defaultdict(int), defaultdict(int)
+        for doc in tokenized:
+            for field, _, ids in doc:
+                totals[field] += len(ids)
+                counts[field] += 1
+
+        pseudo_tfs = defaultdict(lambda: (array('I'), []))
+        for idx, doc in enumerate(tokenized):
+            weighted = defaultdict(float)
+            for field, weight, ids in doc:
+                if not ids:
+                    continue
+                norm = 1 - self.b + self.b * len(ids) / (totals[field] / counts[field])
+                for term_id in ids:
+                    weighted[term_id] += weight / norm
+            for term_id, tf in weighted.items():
+                docs, tfs = pseudo_tfs[term_id]
+                docs.append(idx)
+                tfs.append(tf)
+
+        k1_plus_1 = self.k1 + 1
+        self.postings = {}
+        for term_id, (docs, tfs) in pseudo_tfs.items():
+            idf = log((self.N - len(docs) + 0.5) / (len(docs) + 0.5) + 1)
+            self.postings[term_id] = (docs, array('d', [idf * tf * k1_plus_1 / (self.k1 + tf) for tf in tfs]))
+
+    def top_k(self, query, k, min_score=0, allowed=None):
+        """Return the k best (doc_id, score) pairs; `allowed` optionally filters doc ids"""
+        if k <= 0:
+            return []
+        scores = {}
+        for term_id in self.vocab.lookup(self.tokenize(query)):
+            plist = self.postings.get(term_id)
+            if plist:
+                for idx, weight in zip(*plist):
+                    scores[idx] = scores.get(idx, 0) + weight
+        candidates = ((idx, score) for idx, score in scores.items()
+                      if score > min_score and (allowed is None or allowed(idx)))
+        return heapq.nsmallest(k, candidates, key=lambda x: (-x[1], x[0]))
+
+    def to_dict(self):
+        """Serialize fitted state for the on-disk index (terms as strings)"""
+        terms = self.vocab.terms
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer,
+            "postings": {terms[term_id]: [docs.tolist(), weights.tolist()] for term_id, (docs, weights) in self.postings.items()},
+            "N": self.N
+        }
+
+    @classmethod
+    def from_dict(cls, data, vocab=None):
+        """Restore a fitted instance"""
+        bm25f = cls(data["k1"], data["b"], vocab, data.get("tokenizer"))
+        add = bm25f.vocab.add
+        bm25f.postings = {add(term): (array('I', docs), array('d', weights)) for term, (docs, weights) in data["postings"].items()}
+        bm25f.N = data["N"]
+        return bm25f
+
+
+# ============ CSV STREAMING ============
+# Indexes are built from a single streaming pass that keeps only the search
+# columns. Result rows are decoded on demand from a packed row store shared
+# through mmap (see rowstore.py), or parsed from the CSV at their byte offset.
+def _iter_records(f):
+    """Yield (byte offset, fields) for each CSV record of a binary file; quoted fields may span lines"""
+    offsets = {}  # Line number -> byte offset, for lines of records not yet yielded
+
+    def lines():
+        offset = f.tell()
+        for number, line in enumerate(f, 1):
+            offsets[number] = offset
+            offset += len(line)
+            yield line.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')  # Universal newlines, as in text mode
+
+    reader = csv.reader(lines())
+    first = 1
+    for fields in reader:
+        yield offsets[first], fields
+        for number in range(first, reader.line_num + 1):
+            del offsets[number]
+        first = reader.line_num + 1
+
+
+def _row_dict(header, fields):
+    """Map record fields to the header like csv.DictReader (None for a blank line)"""
+    if not fields:
+        return None
+    row = dict(zip(header, fields))
+    if len(fields) > len(header):
+        row[None] = fields[len(header):]
+    elif len(fields) < len(header):
+        for col in header[len(fields):]:
+            row[col] = None
+    return row
+
+
+def _stream_csv(filepath, columns=None):
+    """Yield (byte offset, row dict) per CSV row, projected to `columns` (all if None)"""
+    with open(filepath, 'rb') as f:
+        records = _iter_records(f)
+        _, header = next(records, (0, []))
+        for offset, fields in records:
+            row = _row_dict(header, fields)
+            if row is None:
+                continue
+            yield offset, row if columns is None else {col: row.get(col, "") for col in columns}
+
+
+def _csv_header(filepath):
+    """Column names of a CSV"""
+    with open(filepath, 'rb') as f:
+        return next(_iter_records(f), (0, []))[1]
+
+
+class CsvRows:
+    """Rows of a CSV projected to output columns, read from disk by byte offset on access"""
+
+    def __init__(self, filepath, header, columns, offsets):
+        self.filepath = filepath
+        self.header = header
+        self.columns = columns
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def row(self, idx):
+        """Full row dict (every column) of row idx"""
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offsets[idx])
+            _, fields = next(_iter_records(f))
+        return _row_dict(self.header, fields)
+
+    def __getitem__(self, idx):
+        row = self.row(idx)
+        return [row.get(col, "") for col in self.columns]
+
+
+class MappedRows:
+    """Rows projected to output columns, decoded cell by cell from a memory-mapped row store"""
+
+    def __init__(self, store, columns):
+        self.store = store
+        self.header = store.header
+        self.columns = columns
+        self._positions = [store.header.index(col) for col in columns]
+
+    def __len__(self):
+        return len(self.store)
+
+    def row(self, idx):
+        """Full row dict (every column) of row idx"""
+        return dict(zip(self.header, self.store.row(idx)))
+
+    def __getitem__(self, idx):
+        return [self.store.value(idx, position) for position in self._positions]
+
+
+def _rows_path(filepath):
+    """Location of the packed row store for a CSV"""
+    digest = format(zlib.crc32(f"{INDEX_VERSION}:{filepath.resolve()}".encode('utf-8')), "08x")
+    return INDEX_DIR / f"{filepath.stem}.{digest}.rows"
+
+
+def _remove_stale(filepath, path):
+    """Delete the files a CSV left in INDEX_DIR under other names (older versions or layouts) than path"""
+    for other in path.parent.glob(f"{filepath.stem}.*{path.suffix}"):
+        if other != path:
+            try:
+                other.unlink()
+            except OSError:
+                pass
+
+
+def _open_rows(filepath, signature, header, columns, offsets):
+    """Row access for an index: the mmap row store (packed on first use), else byte offsets into the CSV"""
+    path = _rows_path(filepath)
+    store = rowstore.open_store(path, signature)
+    if store is None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            rowstore.write_store(path, header, ([row.get(col) for col in header] for _, row in _stream_csv(filepath)),
+                                 signature)
+            _remove_stale(filepath, path)
+        except OSError:
+            pass  # Read-only install: read rows from the CSV instead
+        store = rowstore.open_store(path, signature)
+    if store is None or store.header != header:
+        return CsvRows(filepath, header, columns, offsets)
+    return MappedRows(store, columns)
+
+
+# ============ INDEX CACHE ============
+# Fitted indexes (postings, lengths, IDF) are compiled to INDEX_DIR as JSON and reused until the source
+# CSV changes (checked by mtime/size first, then by content hash).
+_INDEXES = {}
+_SCORERS = {}
+LOAD_TIMINGS = []  # (file, source, seconds) per index load, for --profile-startup
+
+
+def _file_signature(filepath):
+    """Cheap change marker for a data file"""
+    stat = filepath.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _file_hash(filepath):
+    """Content hash for a data file"""
+    import hashlib
+    with open(filepath, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _index_path(filepath, search_cols, output_cols, tokenizer=DEFAULT_TOKENIZER):
+    """Location of the compiled index for a CSV, column layout and tokenizer"""
+    key = json.dumps([INDEX_VERSION, str(filepath.resolve()), search_cols, output_cols, tokenizer])
+    digest = format(zlib.crc32(key.encode('utf-8')), "08x")
+    return INDEX_DIR / f"{filepath.stem}.{digest}.json"
+
+
+def _build_index(filepath, search_cols, output_cols, tokenizer=DEFAULT_TOKENIZER):
+    """Stream the CSV's search columns, fit BM25 and record each row's byte offset"""
+    offsets, documents = [], []
+    for offset, row in _stream_csv(filepath, search_cols):
+        offsets.append(offset)
+        documents.append(" ".join(str(row[col]) for col in search_cols))
+
+    bm25 = BM25(tokenizer=tokenizer)
+    bm25.fit(documents)
+
+    header = _csv_header(filepath)
+    columns = [col for col in output_cols if offsets and col in header]
+    return {
+        "version": INDEX_VERSION,
+        "source": {"signature": _file_signature(filepath), "sha1": _file_hash(filepath)},
+        "header": header,
+        "columns": columns,
+        "offsets": offsets,
+        "bm25": bm25.to_dict()
+    }
+
+
+def _write_index(path, index):
+    """Atomically write a compiled index, ignoring read-only installs"""
+    import tempfile
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _read_index(path):
+    """Read a compiled index, returning None if missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def _load_index(filepath, search_cols, output_cols, tokenizer=DEFAULT_TOKENIZER):
+    """Return (bm25, columns, rows) for a CSV, using memory and disk caches.
+
+    Indexing rows returns a row's output columns, decoded from the memory-mapped
+    row store (MappedRows) or, if that cannot be written, parsed from the CSV
+    at the row's byte offset (CsvRows).
+    """
+    path = _index_path(filepath, search_cols, output_cols, tokenizer)
+    signature = _file_signature(filepath)
+
+    cached = _INDEXES.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    start = time.perf_counter()
+    source = "disk"
+    index = _read_index(path)
+    if index is None or index["source"]["signature"] != signature:
+        if index is not None and index["source"]["sha1"] == _file_hash(filepath):
+            # Touched but unchanged: refresh the stored signature only
+            index["source"]["signature"] = signature
+        else:
+            index = _build_index(filepath, search_cols, output_cols, tokenizer)
+            source = "build"
+            _remove_stale(filepath, path)
+        _write_index(path, index)
+
+    rows = _open_rows(filepath, signature, index["header"], index["columns"], array('Q', index["offsets"]))
+    loaded = (BM25.from_dict(index["bm25"]), index["columns"], rows)
+    _INDEXES[path] = (signature, loaded)
+    LOAD_TIMINGS.append((filepath.name, source, time.perf_counter() - start))
+    return loaded
+
+
+def _load_scorer(filepath, search_cols, output_cols, backend=None, tokenizer=DEFAULT_TOKENIZER):
+    """Like _load_index, with the BM25 converted to the requested backend"""
+    bm25, columns, rows = _load_index(filepath, search_cols, output_cols, tokenizer)
+    cls = get_backend(backend)
+    if cls is BM25:
+        return bm25, columns, rows
+
+    key = (filepath, tokenizer, cls)
+    cached = _SCORERS.get(key)
+    if cached is None or cached[0] is not bm25:
+        cached = (bm25, cls.from_dict(bm25.to_dict()))
+        _SCORERS[key] = cached
+    return cached[1], columns, rows
+
+
+def build_indexes():
+    """Compile on-disk indexes for every domain and stack CSV, plus the unified and similarity indexes"""
+    built = []
+    for config in CSV_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _load_index(filepath, config["search_cols"], config["output_cols"], _tokenizer_for(config))
+            built.append(config["file"])
+    for config in STACK_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            _load_index(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], _tokenizer_for(config))
+            built.append(config["file"])
+    _load_unified_index()
+    built.append("unified")
+    _load_similarity_index()
+    built.append("similarity")
+    return built
+
+
+# ============ UNIFIED INDEX (BM25F) ============
+# One BM25F index over every domain and stack CSV, so a single query is ranked
+# across all of them in one scoring pass. The index stores each CSV's header and
+# row offsets, so the winning rows are opened through the row store without
+# fitting any per-file index.
+_UNIFIED = {}
+
+
+class SourceRows(dict):
+    """label -> rows of that CSV projected to its output columns, opened through _open_rows() on first access"""
+
+    def __init__(self, sources, signatures, row_refs):
+        super().__init__()
+        self._sources = sources
+        self._signatures = signatures
+        self._row_refs = row_refs
+
+    def __missing__(self, label):
+        filepath, config = self._sources[label]
+        header, offsets = self._row_refs[label]
+        columns = [col for col in config["output_cols"] if col in header]
+        rows = self[label] = _open_rows(filepath, self._signatures[label], header, columns, array('Q', offsets))
+        return rows
+
+
+def _unified_sources():
+    """(label, filepath, config) for every domain and stack CSV that exists"""
+    sources = []
+    for domain, config in CSV_CONFIG.items():
+        sources.append((domain, DATA_DIR / config["file"], config))
+    for stack, config in STACK_CONFIG.items():
+        sources.append((f"stack:{stack}", DATA_DIR / config["file"], dict(_STACK_COLS, **config)))
+    return [source for source in sources if source[1].exists()]
+
+
+def _build_unified_index(sources, signatures):
+    """Fit BM25F over all sources: one field per search column plus a domain field"""
+    documents, doc_refs, row_refs = [], [], {}
+    for label, filepath, config in sources:
+        domain_text = f"{label.replace(':', ' ')} {Path(config['file']).stem.replace('-', ' ')}"
+        offsets = []
+        for row_idx, (offset, row) in enumerate(_stream_csv(filepath, config["search_cols"])):
+            fields = [(f"{label}|{col}", FIELD_WEIGHTS.get(col, DEFAULT_FIELD_WEIGHT), row.get(col, ""))
+                      for col in config["search_cols"]]
+            fields.append((f"{label}|domain", DOMAIN_FIELD_WEIGHT, domain_text))
+            documents.append(fields)
+            doc_refs.append([label, row_idx])
+            offsets.append(offset)
+        row_refs[label] = [_csv_header(filepath), offsets]
+
+    bm25f = BM25F()
+    bm25f.fit(documents)
+    return {
+        "version": INDEX_VERSION,
+        "sources": signatures,
+        "weights": [FIELD_WEIGHTS, DEFAULT_FIELD_WEIGHT, DOMAIN_FIELD_WEIGHT],
+        "docs": doc_refs,
+        "rows": row_refs,
+        "bm25f": bm25f.to_dict()
+    }
+
+
+def _load_unified_index():
+    """Return (bm25f, doc_refs, sources by label, version key, SourceRows), rebuilding when any CSV changed"""
+    sources = _unified_sources()
+    signatures = {label: _file_signature(filepath) for label, filepath, _ in sources}
+    path = INDEX_DIR / "unified.json"
+
+    cached = _UNIFIED.get(path)
+    if cached and cached[0] == signatures:
+        return cached[1]
+
+    start = time.perf_counter()
+    source = "disk"
+    index = _read_index(path)
+    weights = [FIELD_WEIGHTS, DEFAULT_FIELD_WEIGHT, DOMAIN_FIELD_WEIGHT]
+    if index is None or index["sources"] != signatures or index["weights"] != weights:
+        index = _build_unified_index(sources, signatures)
+        source = "build"
+        _write_index(path, index)
+
+    version = tuple((label, tuple(signature)) for label, signature in signatures.items())
+    by_label = {label: (fp, cfg) for label, fp, cfg in sources}
+    loaded = (BM25F.from_dict(index["bm25f"]), index["docs"], by_label, version,
+              SourceRows(by_label, signatures, index["rows"]))
+    _UNIFIED[path] = (signatures, loaded)
+    LOAD_TIMINGS.append((path.name, source, time.perf_counter() - start))
+    return loaded
+
+
+# ============ SIMILARITY INDEX (MORE LIKE THIS) ============
+# TF-IDF vectors for every row of every domain and stack CSV, sharing one IDF
+# so rows from different domains are comparable, plus each row's nearest
+# same-domain neighbours, computed when the index is built.
+_SIMILARITY = {}
+
+
+class TfidfVectors:
+    """Sparse, L2-normalised TF-IDF document vectors for cosine similarity.
+
+    A vector is (term ids, weights). An inverted index over the vectors lets a
+    neighbour query touch only documents that share a term with the seed.
+    """
+
+    def __init__(self, vocab=None):
+        self.vocab = vocab if vocab is not None else VOCAB
+        self.vectors = []
+        self.postings = {}
+
+    def fit(self, token_lists):
+        """Build one vector per tokenized document"""
+        counts = []
+        doc_freqs = defaultdict(int)
+        for tokens in token_lists:
             term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+            for term_id in self.vocab.encode(tokens):
+                term_freqs[term_id] += 1
+            counts.append(term_freqs)
+            for term_id in term_freqs:
+                doc_freqs[term_id] += 1
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+        n = len(counts)
+        self.vectors = []
+        for term_freqs in counts:
+            weights = {term_id: (1 + log(tf)) * (log((n + 1) / (doc_freqs[term_id] + 1)) + 1)
+                       for term_id, tf in term_freqs.items()}
+            norm = sqrt(sum(w * w for w in weights.values())) or 1.0
+            ids = sorted(weights)
+            self.vectors.append((array('I', ids), array('d', [weights[term_id] / norm for term_id in ids])))
+        self._index()
 
-            scores.append((idx, score))
+    def _index(self):
+        """Invert the vectors: term id -> (doc ids, weights)"""
+        postings = defaultdict(lambda: (array('I'), array('d')))
+        for idx, (ids, weights) in enumerate(self.vectors):
+            for term_id, weight in zip(ids, weights):
+                docs, doc_weights = postings[term_id]
+                docs.append(idx)
+                doc_weights.append(weight)
+        self.postings = dict(postings)
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def neighbours(self, idx, k, allowed=None):
+        """Return the k (doc_id, cosine) pairs most similar to document idx, excluding itself"""
+        if k <= 0:
+            return []
+        scores = {}
+        for term_id, weight in zip(*self.vectors[idx]):
+            for other, other_weight in zip(*self.postings[term_id]):
+                scores[other] = scores.get(other, 0) + weight * other_weight
+        scores.pop(idx, None)
+        candidates = ((other, score) for other, score in scores.items()
+                      if score > 0 and (allowed is None or allowed(other)))
+        return heapq.nsmallest(k, candidates, key=lambda x: (-x[1], x[0]))
 
+    def to_dict(self):
+        """Serialize the vectors for the on-disk index (terms as strings)"""
+        terms = self.vocab.terms
+        return {"vectors": [[[terms[term_id] for term_id in ids], weights.tolist()] for ids, weights in self.vectors]}
 
-# ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+    @classmethod
+    def from_dict(cls, data, vocab=None):
+        """Restore the vectors without re-tokenizing the corpus"""
+        tfidf = cls(vocab)
+        add = tfidf.vocab.add
+        tfidf.vectors = [(array('I', [add(term) for term in terms]), array('d', weights)) for terms, weights in data["vectors"]]
+        tfidf._index()
+        return tfidf
+
+
+def _build_similarity_index(sources, signatures):
+    """Vectorise every row and precompute its same-domain neighbour list"""
+    token_lists, doc_refs, row_refs = [], [], {}
+    for label, filepath, config in sources:
+        tokenize = get_tokenizer(_tokenizer_for(config))
+        offsets = []
+        for row_idx, (offset, row) in enumerate(_stream_csv(filepath, config["search_cols"])):
+            token_lists.append(tokenize(" ".join(str(row.get(col, "")) for col in config["search_cols"])))
+            doc_refs.append([label, row_idx])
+            offsets.append(offset)
+        row_refs[label] = [_csv_header(filepath), offsets]
+
+    tfidf = TfidfVectors()
+    tfidf.fit(token_lists)
+    neighbours = []
+    for idx, (label, _) in enumerate(doc_refs):
+        same_domain = lambda other, label=label: doc_refs[other][0] == label
+        hits = tfidf.neighbours(idx, SIMILAR_NEIGHBOURS, allowed=same_domain)
+        neighbours.append([[other for other, _ in hits], [round(score, 6) for _, score in hits]])
+    return {
+        "version": INDEX_VERSION,
+        "sources": signatures,
+        "neighbour_count": SIMILAR_NEIGHBOURS,
+        "docs": doc_refs,
+        "rows": row_refs,
+        "tfidf": tfidf.to_dict(),
+        "neighbours": neighbours
+    }
+
+
+def _load_similarity_index():
+    """Return (tfidf, doc_refs, neighbours, sources by label, SourceRows), rebuilding when any CSV changed"""
+    sources = _unified_sources()
+    signatures = {label: _file_signature(filepath) for label, filepath, _ in sources}
+    path = INDEX_DIR / "similarity.json"
+
+    cached = _SIMILARITY.get(path)
+    if cached and cached[0] == signatures:
+        return cached[1]
+
+    start = time.perf_counter()
+    source = "disk"
+    index = _read_index(path)
+    if index is None or index["sources"] != signatures or index["neighbour_count"] != SIMILAR_NEIGHBOURS:
+        index = _build_similarity_index(sources, signatures)
+        source = "build"
+        _write_index(path, index)
+
+    by_label = {label: (fp, cfg) for label, fp, cfg in sources}
+    loaded = (TfidfVectors.from_dict(index["tfidf"]), index["docs"], index["neighbours"], by_label,
+              SourceRows(by_label, signatures, index["rows"]))
+    _SIMILARITY[path] = (signatures, loaded)
+    LOAD_TIMINGS.append((path.name, source, time.perf_counter() - start))
+    return loaded
+
+
+# ============ RESULT CACHE ============
+class LRUCache:
+    """Bounded mapping with least-recently-used eviction and hit/miss counters"""
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()  # The search daemon serves requests from threads
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value (refreshing its recency) or None"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Keyed on (file, file signature, backend, query tokens, k): editing a CSV
+# changes its signature, so stale entries are never hit and age out.
+RESULT_CACHE = LRUCache()
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
+def cache_stats():
+    """Hit/miss/eviction counters of the search result cache"""
+    return RESULT_CACHE.stats()
+
+
+def _rank(filepath, search_cols, output_cols, queries, ks, backend=None, tokenizer=DEFAULT_TOKENIZER):
+    """Top-k result rows for several queries against one CSV, via the result cache"""
+    signature = tuple(_file_signature(filepath))
+    tokenize = get_tokenizer(tokenizer)
+    keys = [(str(filepath), signature, backend or DEFAULT_BACKEND, tokenizer, tuple(tokenize(query)), k)
+            for query, k in zip(queries, ks)]
+    results = [RESULT_CACHE.get(key) for key in keys]
+
+    missing = [i for i, cached in enumerate(results) if cached is None]
+    if missing:
+        bm25, columns, rows = _load_scorer(filepath, search_cols, output_cols, backend, tokenizer)
+        ranked = _top_k_many(bm25, [queries[i] for i in missing], [ks[i] for i in missing])
+        for i, hits in zip(missing, ranked):
+            results[i] = [dict(zip(columns, rows[idx])) for idx, _ in hits]
+            RESULT_CACHE.put(keys[i], results[i])
+
+    # Callers get their own row dicts so the cached ones cannot be mutated
+    return [[dict(row) for row in cached] for cached in results]
+
+
+# ============ SEARCH FUNCTIONS ============
+def _search_csv(filepath, search_cols, output_cols, query, max_results, backend=None, tokenizer=DEFAULT_TOKENIZER):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
+    # Get top results with score > 0
+    return _rank(filepath, search_cols, output_cols, [query], [max_results], backend, tokenizer)[0]
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+def _top_k_many(bm25, queries, ks):
+    """top_k() for several queries, batched when the backend supports it"""
+    if len(queries) > 1 and hasattr(bm25, "top_k_batch"):
+        batch = bm25.top_k_batch(queries, max(ks))
+        return [hits[:max(k, 0)] for hits, k in zip(batch, ks)]
+    return [bm25.top_k(query, k) for query, k in zip(queries, ks)]
+
+
+# ============ DOMAIN DETECTION ============
+# Chinese keywords (see tokenizer.ZH_TERMS) match anywhere, as CJK text has no word breaks
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb", "颜色", "配色", "色板", "调色板"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel", "图表", "折线图", "柱状图", "饼图", "散点图", "热力图", "漏斗", "趋势", "可视化"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section", "落地页", "着陆页", "首屏", "定价", "用户评价", "转化", "行动号召"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard", "电商", "金融", "医疗", "游戏", "作品集", "加密货币", "仪表盘", "仪表板", "后台"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind", "风格", "设计", "极简", "玻璃拟态", "毛玻璃", "新拟态", "野兽派", "深色模式", "暗黑模式", "扁平", "极光"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile", "可用性", "可访问性", "无障碍", "触摸", "滚动", "动画", "键盘", "导航", "移动端"],
+    "typography": ["font", "typography", "heading", "serif", "sans", "字体", "排版", "标题", "衬线", "无衬线"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon", "图标"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect", "表单", "输入框"]
+}
+DEFAULT_DOMAIN = "style"
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
 
-    return results
+class DomainClassifier:
+    """Keyword domain classifier backed by one compiled regex.
+
+    Keywords match on word boundaries (with an optional plural "s"/"es"), so
+    "ui" no longer fires inside "build" and "bar" not inside "barrel". The bare
+    "#" keyword matches hex colour literals such as "#1e293b".
+    """
+
+    def __init__(self, keywords, default=DEFAULT_DOMAIN):
+        self.default = default
+        self.domains = list(keywords)
+        self._owners = {}  # keyword -> domains listing it
+        for domain, words in keywords.items():
+            for word in words:
+                self._owners.setdefault(word.lower(), []).append(domain)
+        # Longest first so multi-word keywords win over their parts
+        self._keywords = sorted(self._owners, key=lambda w: (-len(w), w))
+        alternatives = [f"({self._keyword_pattern(w)})" for w in self._keywords]
+        self._pattern = re.compile("|".join(alternatives))
+
+    @staticmethod
+    def _keyword_pattern(word):
+        if word == "#":
+            return r"#[0-9a-f]{3,8}(?![0-9a-z])"
+        return rf"(?<![0-9a-z]){re.escape(word)}(?:e?s)?(?![0-9a-z])"
+
+    def scores(self, query):
+        """Number of distinct keywords matched per domain"""
+        matched = {self._keywords[m.lastindex - 1] for m in self._pattern.finditer(query.lower())}
+        scores = dict.fromkeys(self.domains, 0)
+        for word in matched:
+            for domain in self._owners[word]:
+                scores[domain] += 1
+        return scores
+
+    def classify(self, query):
+        """Return (domain, confidence, scores); confidence is the winner's share of keyword hits"""
+        scores = self.scores(query)
+        best = max(scores, key=scores.get)
+        total = sum(scores.values())
+        if not total:
+            return self.default, 0.0, scores
+        return best, round(scores[best] / total, 4), scores
+
+
+_DOMAIN_CLASSIFIER = None
+
+
+def _domain_classifier():
+    """The keyword classifier, compiled on first use so importing core stays cheap"""
+    global _DOMAIN_CLASSIFIER
+    if _DOMAIN_CLASSIFIER is None:
+        _DOMAIN_CLASSIFIER = DomainClassifier(DOMAIN_KEYWORDS)
+    return _DOMAIN_CLASSIFIER
+
+
+def classify_domain(query):
+    """Detect the domain of a query along with a confidence score"""
+    domain, confidence, scores = _domain_classifier().classify(query)
+    return {"domain": domain, "confidence": confidence, "scores": scores}
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
+    return _domain_classifier().classify(query)[0]
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
 
-
-def search(query, domain=None, max_results=MAX_RESULTS):
+def search(query, domain=None, max_results=MAX_RESULTS, backend=None):
     """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
+    return search_many([(query, domain, max_results)], backend)[0]
 
-    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
-    filepath = DATA_DIR / config["file"]
 
-    if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
+def _index_compiled(filepath, search_cols, output_cols, tokenizer=DEFAULT_TOKENIZER):
+    """True if a CSV's index is in memory, or compiled on disk since the CSV last changed"""
+    path = _index_path(filepath, search_cols, output_cols, tokenizer)
+    cached = _INDEXES.get(path)
+    if cached and cached[0] == _file_signature(filepath):
+        return True
+    try:
+        return path.stat().st_mtime_ns >= filepath.stat().st_mtime_ns
+    except OSError:
+        return False
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
 
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+def _compile_index(index_dir, filepath, search_cols, output_cols, tokenizer=DEFAULT_TOKENIZER):
+    """Build and write a CSV's index into index_dir (run in a freshly started worker process)"""
+    global INDEX_DIR
+    INDEX_DIR = index_dir
+    _load_index(filepath, search_cols, output_cols, tokenizer)
+
+
+def _rank_domains(jobs, workers):
+    """_rank() each job's argument tuple, concurrently when workers > 1; results in job order.
+
+    Indexes that have to be built are compiled to disk by worker processes,
+    since fitting is CPU-bound (at most one per CPU); ranking then runs on
+    threads in this process, which loads the compiled indexes and keeps them
+    warm. Workers are never forked: the caller may be the threaded daemon, and
+    a child forked while another thread holds a lock (vocabulary, result
+    cache) would deadlock.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [_rank(*args) for args in jobs]
+
+    from concurrent.futures import ThreadPoolExecutor
+    cold = [(filepath, search_cols, output_cols, tokenizer)
+            for filepath, search_cols, output_cols, _, _, _, tokenizer in jobs
+            if not _index_compiled(filepath, search_cols, output_cols, tokenizer)]
+    processes = min(workers, len(cold), os.cpu_count() or 1)
+    if processes > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        try:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(method)) as pool:
+                list(pool.map(_compile_index, [INDEX_DIR] * len(cold), *zip(*cold)))
+        except (OSError, BrokenProcessPool):
+            pass  # No usable process pool (e.g. sandboxed): the threads below build them
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(lambda args: _rank(*args), jobs))
+
+
+def search_many(requests, backend=None, workers=None):
+    """Run several (query, domain, max_results) searches in one pass.
+
+    Requests are grouped by domain so each index is loaded once and all of its
+    queries are scored together. Results come back in request order, each in
+    the same shape search() returns; a domain of None is auto-detected.
+    workers > 1 (default SEARCH_WORKERS) handles the domains concurrently.
+    """
+    if backend is not None and backend not in AVAILABLE_BACKENDS:
+        return [{"error": f"Unknown backend: {backend}. Available: {', '.join(AVAILABLE_BACKENDS)}"} for _ in requests]
+
+    responses = [None] * len(requests)
+    by_domain = defaultdict(list)
+    for i, (query, domain, max_results) in enumerate(requests):
+        by_domain[domain or detect_domain(query)].append((i, query, max_results))
 
+    groups, jobs = [], []
+    for domain, items in by_domain.items():
+        config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
+        if not filepath.exists():
+            for i, _, _ in items:
+                responses[i] = {"error": f"File not found: {filepath}", "domain": domain}
+            continue
+
+        groups.append((domain, config, items))
+        jobs.append((filepath, config["search_cols"], config["output_cols"],
+                     [query for _, query, _ in items], [k for _, _, k in items], backend, _tokenizer_for(config)))
+
+    ranked_groups = _rank_domains(jobs, SEARCH_WORKERS if workers is None else workers)
+    for (domain, config, items), ranked in zip(groups, ranked_groups):
+        for (i, query, _), results in zip(items, ranked):
+            responses[i] = {
+                "domain": domain,
+                "query": query,
+                "file": config["file"],
+                "count": len(results),
+                "results": results
+            }
+
+    return responses
+
+
+def search_stack(query, stack, max_results=MAX_RESULTS, backend=None):
     """Search stack-specific guidelines"""
+    if backend is not None and backend not in AVAILABLE_BACKENDS:
+        return {"error": f"Unknown backend: {backend}. Available: {', '.join(AVAILABLE_BACKENDS)}"}
+
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
 
@@ -241,7 +1263,8 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results, backend,
+                          _tokenizer_for(STACK_CONFIG[stack]))
 
     return {
         "domain": "stack",
@@ -251,3 +1274,75 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def search_all(query, max_results=MAX_RESULTS, domains=None):
+    """Rank rows from every domain and stack CSV in one BM25F pass.
+
+    domains optionally restricts results to labels such as "color" or
+    "stack:flutter". Each result row carries its "Domain" label first.
+    """
+    bm25f, doc_refs, _, version, source_rows = _load_unified_index()
+    allowed = None
+    if domains:
+        wanted = set(domains)
+        allowed = lambda idx: doc_refs[idx][0] in wanted
+
+    key = ("unified", version, tuple(bm25f.tokenize(query)), max_results, tuple(sorted(domains or ())))
+    results = RESULT_CACHE.get(key)
+    if results is None:
+        results = []
+        for idx, _ in bm25f.top_k(query, max_results, allowed=allowed):
+            label, row_idx = doc_refs[idx]
+            rows = source_rows[label]
+            results.append({"Domain": label, **dict(zip(rows.columns, rows[row_idx]))})
+        RESULT_CACHE.put(key, results)
+
+    return {
+        "domain": "all",
+        "query": query,
+        "file": "unified index",
+        "count": len(results),
+        "results": [dict(row) for row in results]
+    }
+
+
+def similar(domain, row_id, k=MAX_RESULTS, domains=None):
+    """Rows most similar to row `row_id` (0-based) of a domain or "stack:<name>" CSV.
+
+    By default neighbours come from the same domain, read from the lists
+    precomputed at index time. domains optionally names other labels to
+    search instead (e.g. ["color", "typography"]); those are ranked on demand
+    from the stored vectors. Each result row carries "Domain" and "Similarity".
+    """
+    tfidf, doc_refs, neighbours, sources, source_rows = _load_similarity_index()
+    if domain not in sources:
+        return {"error": f"Unknown domain: {domain}. Available: {', '.join(sources)}"}
+
+    first = next((idx for idx, (label, _) in enumerate(doc_refs) if label == domain), None)
+    idx = None if first is None else first + row_id
+    if first is None or row_id < 0 or idx >= len(doc_refs) or doc_refs[idx][0] != domain:
+        return {"error": f"Row {row_id} out of range for {domain}", "domain": domain}
+
+    wanted = set(domains or [domain])
+    if wanted == {domain} and k <= SIMILAR_NEIGHBOURS:
+        docs, scores = neighbours[idx]
+        hits = list(zip(docs, scores))[:max(k, 0)]
+    else:
+        hits = tfidf.neighbours(idx, k, allowed=lambda other: doc_refs[other][0] in wanted)
+
+    results = []
+    for other, score in hits:
+        label, other_row = doc_refs[other]
+        rows = source_rows[label]
+        results.append({"Domain": label, **dict(zip(rows.columns, rows[other_row])), "Similarity": round(score, 4)})
+
+    filepath, config = sources[domain]
+    return {
+        "domain": domain,
+        "query": f"like row {row_id}",
+        "row_id": row_id,
+        "file": config["file"],
+        "count": len(results),
+        "results": results
+    }
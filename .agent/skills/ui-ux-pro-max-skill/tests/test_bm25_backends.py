@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parity tests: the NumPy BM25 backend must rank exactly like the pure-Python scorer.
+Run: python -m unittest discover -s tests
+"""
+
+import csv
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from core import BM25, CSV_CONFIG, DATA_DIR, NumpyBM25, get_backend, numpy_available, search
+
+QUERIES = [
+    "saas dashboard",
+    "glassmorphism dark mode",
+    "fintech banking trust",
+    "luxury ecommerce serif",
+    "accessibility keyboard focus contrast",
+    "no such words anywhere",
+]
+
+
+def _documents(domain):
+    config = CSV_CONFIG[domain]
+    with open(DATA_DIR / config["file"], 'r', encoding='utf-8') as f:
+        return [" ".join(str(row.get(col, "")) for col in config["search_cols"]) for row in csv.DictReader(f)]
+
+
+@unittest.skipUnless(numpy_available(), "NumPy not installed")
+class NumpyBackendParityTest(unittest.TestCase):
+
+    def test_scores_match_python(self):
+        for domain in ["style", "color", "product", "ux", "typography"]:
+            docs = _documents(domain)
+            python_bm25, numpy_bm25 = BM25(), NumpyBM25()
+            python_bm25.fit(docs)
+            numpy_bm25.fit(docs)
+            for query in QUERIES:
+                expected = dict(python_bm25.score(query))
+                actual = numpy_bm25.score_batch([query])[0]
+                for idx, score in expected.items():
+                    self.assertAlmostEqual(score, actual[idx], places=9, msg=f"{domain}: {query}")
+
+    def test_top_k_matches_python(self):
+        docs = _documents("style")
+        python_bm25 = BM25()
+        python_bm25.fit(docs)
+        numpy_bm25 = NumpyBM25.from_dict(python_bm25.to_dict())
+        for query in QUERIES:
+            for k in (1, 3, 10):
+                expected = python_bm25.top_k(query, k)
+                actual = numpy_bm25.top_k(query, k)
+                self.assertEqual([idx for idx, _ in expected], [idx for idx, _ in actual], query)
+
+    def test_batch_matches_single(self):
+        numpy_bm25 = NumpyBM25()
+        numpy_bm25.fit(_documents("landing"))
+        batch = numpy_bm25.top_k_batch(QUERIES, 3)
+        self.assertEqual(batch, [numpy_bm25.top_k(query, 3) for query in QUERIES])
+
+    def test_search_api_parity(self):
+        for query in QUERIES:
+            self.assertEqual(search(query, backend="python"), search(query, backend="numpy"))
+
+
+class BackendSelectionTest(unittest.TestCase):
+
+    def test_fallback_without_numpy(self):
+        self.assertIs(get_backend("python"), BM25)
+        self.assertIs(get_backend("numpy"), NumpyBM25 if numpy_available() else BM25)
+
+    def test_unknown_backend(self):
+        self.assertIn("error", search("saas", backend="lucene"))
+        with self.assertRaises(ValueError):
+            get_backend("lucene")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search daemon tests: private runtime directory, TCP tokens and local-only persistence.
+Run: python -m unittest discover -s tests
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from daemon import DaemonUnavailable, _make_server, daemon_address, dispatch, request
+
+
+class DaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def start(self, address):
+        server = _make_server(address)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def raw_exchange(self, address, payload):
+        with socket.create_connection(address, timeout=5) as sock:
+            sock.sendall(payload)
+            with sock.makefile('rb') as f:
+                return [json.loads(line) for line in f]
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX") and hasattr(os, "getuid"), "Unix sockets only")
+    def test_unix_socket_in_private_directory(self):
+        address = daemon_address(create=True)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(address)).st_mode), 0o700)
+        self.start(address)
+        self.assertEqual(stat.S_IMODE(os.stat(address).st_mode) & 0o077, 0)
+        self.assertEqual(request("ping", address=address), "pong")
+
+        os.chmod(os.path.dirname(address), 0o755)
+        with self.assertRaises(PermissionError):
+            daemon_address()
+        with self.assertRaises(DaemonUnavailable):
+            request("ping")
+
+    def test_tcp_requires_token(self):
+        server = self.start(("127.0.0.1", 0))
+        address = server.server_address
+        self.assertEqual(request("ping", address=address), "pong")
+
+        replies = self.raw_exchange(address, b'{"op": "shutdown"}\n{"op": "ping"}\n')
+        self.assertEqual(len(replies), 1)  # Connection closed after the refusal
+        self.assertIn("token", replies[0]["error"])
+        replies = self.raw_exchange(address, b'POST / HTTP/1.1\r\nHost: localhost\r\n\r\n{"op": "shutdown"}\n')
+        self.assertEqual(len(replies), 1)
+        self.assertFalse(replies[0]["ok"])
+        self.assertEqual(request("ping", address=address), "pong")
+
+    def test_persist_runs_locally(self):
+        server = self.start(("127.0.0.1", 0))
+        with self.assertRaisesRegex(DaemonUnavailable, "PermissionError"):
+            request("design_system", address=server.server_address, query="saas", persist=True, output_dir=self.tmp.name)
+        with mock.patch("daemon.request") as remote:
+            trace = {}
+            result = dispatch("design_system", trace=trace, query="saas", project_name="Local", persist=True,
+                              output_dir=self.tmp.name)
+        remote.assert_not_called()
+        self.assertEqual(trace["route"], "local")
+        self.assertTrue(result["persist"]["created"])
+
+
+if __name__ == "__main__":
+    unittest.main()
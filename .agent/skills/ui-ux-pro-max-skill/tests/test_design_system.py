@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Design-system generator tests against the shipped reasoning rules.
+Run: python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from design_system import DesignSystemGenerator
+
+
+def linear_scan(rules, category):
+    """Reference lookup: exact, then substring, then keyword match, earliest rule first"""
+    category_lower = category.lower()
+    for rule in rules:
+        if rule.get("UI_Category", "").lower() == category_lower:
+            return rule
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        if ui_cat in category_lower or category_lower in ui_cat:
+            return rule
+    for rule in rules:
+        keywords = rule.get("UI_Category", "").lower().replace("/", " ").replace("-", " ").split()
+        if any(kw in category_lower for kw in keywords):
+            return rule
+    return {}
+
+
+class ReasoningRuleTest(unittest.TestCase):
+
+    def test_matches_linear_scan(self):
+        generator = DesignSystemGenerator()
+        rules = generator.reasoning_data
+        self.assertTrue(rules)
+
+        categories = ["", "zzz", "Unknown Widget"]
+        for rule in rules:
+            ui_cat = rule["UI_Category"]
+            words = ui_cat.replace("/", " ").replace("-", " ").split()
+            categories += [
+                ui_cat, ui_cat.upper(), ui_cat.swapcase(),     # Exact, any case
+                f"My {ui_cat} App", ui_cat[:len(ui_cat) // 2],  # Substring either way
+                f"zz {words[-1]} zz", f"{words[0]}ish tool",    # Keyword only
+            ]
+
+        for category in categories:
+            with self.subTest(category=category):
+                expected = linear_scan(rules, category)
+                for _ in range(2):  # Computed, then memoised
+                    found = generator._find_reasoning_rule(category)
+                    if expected:
+                        self.assertIs(found, expected)  # The same row, not just an equal one
+                    else:
+                        self.assertEqual(found, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Design-system persistence tests, writing into a temporary output directory.
+Run: python -m unittest discover -s tests
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import design_system
+from design_system import DesignSystemGenerator, _atomic_write, load_pages_manifest, persist_design_system
+
+
+class PersistTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.design_system = DesignSystemGenerator().generate("SaaS dashboard", "Demo App")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.tmp.name)
+        self.project_dir = self.output_dir / "design-system" / "demo-app"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def persist(self, **kwargs):
+        return persist_design_system(self.design_system, output_dir=str(self.output_dir), **kwargs)
+
+    def test_pages_in_one_run(self):
+        result = self.persist(page="Dashboard", pages=["Settings", ("Checkout", "payment form"), "dashboard"])
+        pages_dir = self.project_dir / "pages"
+        expected = [self.project_dir / "MASTER.md"] + [pages_dir / f"{name}.md" for name in ("dashboard", "settings", "checkout")]
+        self.assertEqual(result["created_files"], [str(path) for path in expected])
+        self.assertEqual(result["created"], result["created_files"])
+        self.assertEqual(sorted(path.name for path in pages_dir.iterdir()), ["checkout.md", "dashboard.md", "settings.md"])
+        self.assertIn("Checkout", (pages_dir / "checkout.md").read_text(encoding='utf-8'))
+
+    def test_pages_deduped_by_file_name(self):
+        result = self.persist(pages=["My Page", "my-page"])
+        page = self.project_dir / "pages" / "my-page.md"
+        self.assertEqual(result["created_files"], [str(self.project_dir / "MASTER.md"), str(page)])
+        self.assertIn("My Page", page.read_text(encoding='utf-8'))
+
+    def test_load_pages_manifest(self):
+        path = self.output_dir / "pages.txt"
+        path.write_text("# Pages\n\nDashboard\nCheckout: payment form, trust badges\n  Settings :  \n", encoding='utf-8')
+        self.assertEqual(load_pages_manifest(str(path)),
+                         [("Dashboard", None), ("Checkout", "payment form, trust badges"), ("Settings", None)])
+
+    def test_write_outcomes(self):
+        master, page = str(self.project_dir / "MASTER.md"), str(self.project_dir / "pages" / "dashboard.md")
+        self.assertEqual(self.persist(page="Dashboard")["created"], [master, page])
+
+        rerun = self.persist(page="Dashboard")
+        self.assertEqual((rerun["created"], rerun["updated"], rerun["unchanged"]), ([], [], [master, page]))
+
+        with open(master, 'a', encoding='utf-8') as f:
+            f.write("\nManual edit\n")
+        edited = self.persist(page="Dashboard")
+        self.assertEqual((edited["updated"], edited["unchanged"]), ([master], [page]))
+        self.assertNotIn("Manual edit", Path(master).read_text(encoding='utf-8'))
+
+        changed = dict(self.design_system, pattern=dict(self.design_system["pattern"], name="Changed Pattern"))
+        result = persist_design_system(changed, output_dir=str(self.output_dir))
+        self.assertEqual(result["updated"], [master])
+
+    def test_atomic_write_modes(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        path = self.output_dir / "file.md"
+        _atomic_write(path, "one")
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o666 & ~umask)
+
+        path.chmod(0o640)
+        _atomic_write(path, "two")
+        self.assertEqual(path.read_text(encoding='utf-8'), "two")
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o640)
+        self.assertEqual(os.listdir(self.output_dir), ["file.md"])
+
+    def test_failed_write_keeps_original(self):
+        path = self.output_dir / "file.md"
+        _atomic_write(path, "original")
+        with mock.patch.object(design_system.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                _atomic_write(path, "new")
+        self.assertEqual(path.read_text(encoding='utf-8'), "original")
+        self.assertEqual(os.listdir(self.output_dir), ["file.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
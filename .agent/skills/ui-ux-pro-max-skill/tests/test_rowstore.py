@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Packed row store tests.
+Run: python -m unittest discover -s tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import rowstore
+from core import CSV_CONFIG, DATA_DIR, CsvRows, MappedRows, _csv_header, _load_index, _stream_csv, _tokenizer_for
+
+
+class RowStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "rows.rows")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        rows = [["1", "Alpha", "ünïcode, 中文"], ["2", "Beta", None], ["3", "Alpha", ""]]
+        rowstore.write_store(self.path, ["No", "Name", "Notes"], rows, [123, 45])
+        store = rowstore.open_store(self.path, [123, 45])
+        self.assertEqual(store.header, ["No", "Name", "Notes"])
+        self.assertEqual(len(store), 3)
+        self.assertEqual([store.row(i) for i in range(3)], rows)
+        self.assertEqual(store.value(2, 1), "Alpha")
+        with self.assertRaises(IndexError):
+            store.value(3, 0)
+        store.close()
+
+    def test_stale_signature(self):
+        rowstore.write_store(self.path, ["No"], [["1"]], [1, 1])
+        self.assertIsNone(rowstore.open_store(self.path, [2, 1]))
+        self.assertIsNone(rowstore.open_store(self.path + ".missing", [1, 1]))
+
+    def test_matches_csv_rows(self):
+        config = CSV_CONFIG["style"]
+        filepath = DATA_DIR / config["file"]
+        _, columns, rows = _load_index(filepath, config["search_cols"], config["output_cols"], _tokenizer_for(config))
+        self.assertIsInstance(rows, MappedRows)
+        csv_rows = CsvRows(filepath, _csv_header(filepath), columns, [offset for offset, _ in _stream_csv(filepath)])
+        self.assertEqual(len(rows), len(csv_rows))
+        for idx in range(len(rows)):
+            self.assertEqual(rows[idx], csv_rows[idx])
+            self.assertEqual(rows.row(idx), csv_rows.row(idx))
+
+
+if __name__ == "__main__":
+    unittest.main()
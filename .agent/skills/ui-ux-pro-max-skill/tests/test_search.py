@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search API tests against the shipped CSV data.
+Run: python -m unittest discover -s tests
+"""
+
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import core
+from core import CsvRows, LRUCache, _csv_header, _stream_csv, classify_domain, detect_domain, search, search_all, search_many, similar
+
+
+class SearchManyTest(unittest.TestCase):
+
+    def test_matches_individual_searches(self):
+        requests = [("saas dashboard", "product", 2), ("dark glass", "style", 3), ("fintech", None, 1)]
+        self.assertEqual(search_many(requests), [search(*request) for request in requests])
+
+    def test_concurrent_matches_sequential(self):
+        requests = [("saas dashboard", "product", 2), ("dark glass", "style", 3), ("serif", "typography", 2),
+                    ("fintech", "color", 1), ("hero", "landing", 2), ("minimal", "style", 1)]
+        self.assertEqual(search_many(requests, workers=4), search_many(requests, workers=1))
+
+    def test_cold_indexes_compiled_by_worker_processes(self):
+        requests = [("saas dashboard", "product", 2), ("dark glass", "style", 3), ("serif", "typography", 2)]
+        expected = search_many(requests, workers=1)
+        caches = (core._INDEXES, core._SCORERS, core.RESULT_CACHE)
+        self.addCleanup(setattr, core, "INDEX_DIR", core.INDEX_DIR)
+        for cache in caches:
+            self.addCleanup(cache.clear)
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(core.os, "cpu_count", return_value=4):
+            core.INDEX_DIR = Path(tmp)
+            for cache in caches:
+                cache.clear()
+            del core.LOAD_TIMINGS[:]
+            self.assertEqual(search_many(requests, workers=4), expected)
+            self.assertEqual(len(list(Path(tmp).glob("*.json"))), 3)
+            # Built by the workers into the patched INDEX_DIR, then loaded here from disk
+            self.assertEqual({source for _, source, _ in core.LOAD_TIMINGS}, {"disk"})
+
+
+class DomainDetectionTest(unittest.TestCase):
+
+    def test_word_boundaries(self):
+        self.assertEqual(detect_domain("barrel files"), "react")  # not "bar" -> chart
+        self.assertEqual(detect_domain("build a ui"), "style")
+        self.assertEqual(detect_domain("pie charts"), "chart")
+
+    def test_hex_literal(self):
+        self.assertEqual(detect_domain("brand #1e293b"), "color")
+
+    def test_confidence(self):
+        self.assertEqual(classify_domain("zzz")["confidence"], 0.0)
+        self.assertEqual(classify_domain("zzz")["domain"], "style")
+        result = classify_domain("dark mode landing pages")
+        self.assertEqual(result["domain"], "landing")
+        self.assertAlmostEqual(result["confidence"], 2 / 3, places=3)
+
+
+class UnifiedSearchTest(unittest.TestCase):
+
+    def test_ranks_across_domains(self):
+        result = search_all("flutter state management", 3)
+        self.assertEqual(result["domain"], "all")
+        self.assertEqual(result["results"][0]["Domain"], "stack:flutter")
+
+    def test_domain_filter(self):
+        result = search_all("dark elegant", 5, domains=["color", "typography"])
+        self.assertTrue(result["results"])
+        self.assertTrue(all(row["Domain"] in ("color", "typography") for row in result["results"]))
+
+    def test_no_per_domain_indexes(self):
+        caches = (core._INDEXES, core._UNIFIED, core._SIMILARITY, core.RESULT_CACHE)
+        original = core.INDEX_DIR
+        self.addCleanup(setattr, core, "INDEX_DIR", original)
+        for cache in caches:
+            self.addCleanup(cache.clear)
+        with tempfile.TemporaryDirectory() as tmp:
+            core.INDEX_DIR = Path(tmp)
+            for cache in caches:
+                cache.clear()
+            del core.LOAD_TIMINGS[:]
+            results = search_all("flutter list state", 5)["results"] + similar("style", 0, 12, domains=["color"])["results"]
+            self.assertEqual(len(results), 17)
+            self.assertEqual([(name, source) for name, source, _ in core.LOAD_TIMINGS],
+                             [("unified.json", "build"), ("similarity.json", "build")])
+            self.assertEqual(core._INDEXES, {})
+
+
+class SimilarTest(unittest.TestCase):
+
+    def test_precomputed_matches_on_demand(self):
+        precomputed = similar("style", 0, 5)["results"]
+        on_demand = similar("style", 0, 12)["results"][:5]  # More than the precomputed list holds
+        self.assertEqual(len(precomputed), 5)
+        self.assertEqual([row["Style Category"] for row in precomputed], [row["Style Category"] for row in on_demand])
+        scores = [row["Similarity"] for row in precomputed]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_cross_domain(self):
+        result = similar("style", 0, 3, domains=["color", "typography"])
+        self.assertTrue(all(row["Domain"] in ("color", "typography") for row in result["results"]))
+
+    def test_bad_row(self):
+        self.assertIn("error", similar("style", -1))
+        self.assertIn("error", similar("unknown", 0))
+
+    def test_header_only_domain(self):
+        original = core.DATA_DIR, core.INDEX_DIR
+        self.addCleanup(setattr, core, "DATA_DIR", original[0])
+        self.addCleanup(setattr, core, "INDEX_DIR", original[1])
+        with tempfile.TemporaryDirectory() as tmp:
+            core.DATA_DIR, core.INDEX_DIR = Path(tmp), Path(tmp) / ".cache"
+            shutil.copy(original[0] / "styles.csv", tmp)
+            header = _csv_header(original[0] / "charts.csv")
+            (Path(tmp) / "charts.csv").write_text(",".join(header) + "\n", encoding='utf-8')
+            self.assertEqual(similar("chart", 0), {"error": "Row 0 out of range for chart", "domain": "chart"})
+            self.assertEqual(similar("style", 0, 1)["count"], 1)
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def test_lru_eviction_and_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", [1])
+        cache.put("b", [2])
+        self.assertEqual(cache.get("a"), [1])  # "b" is now least recently used
+        cache.put("c", [3])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), [3])
+        self.assertEqual(cache.stats(), {"size": 2, "maxsize": 2, "hits": 2, "misses": 1, "evictions": 1,
+                                         "hit_rate": 0.6667})
+        cache.clear()
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["misses"]), (0, 0, 0))
+
+    def test_repeat_search_hits(self):
+        core.RESULT_CACHE.clear()
+        first = search("saas dashboard", "product", 2)
+        expected = first["results"][0]["Product Type"]
+        first["results"][0]["Product Type"] = "mutated"  # Must not leak into the cached copy
+        self.assertEqual(search("saas dashboard", "product", 2)["results"][0]["Product Type"], expected)
+        stats = core.cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_csv_change_invalidates(self):
+        header = _csv_header(core.DATA_DIR / "products.csv")
+        original = core.DATA_DIR, core.INDEX_DIR
+        self.addCleanup(setattr, core, "DATA_DIR", original[0])
+        self.addCleanup(setattr, core, "INDEX_DIR", original[1])
+        self.addCleanup(core.RESULT_CACHE.clear)
+        with tempfile.TemporaryDirectory() as tmp:
+            core.DATA_DIR, core.INDEX_DIR = Path(tmp), Path(tmp) / ".cache"
+            path = Path(tmp) / "products.csv"
+
+            def write(product_type):
+                with open(path, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerow(["1", product_type, "zebra"] + [""] * (len(header) - 3))
+
+            core.RESULT_CACHE.clear()
+            write("Zebra Tool")
+            self.assertEqual(search("zebra", "product")["results"][0]["Product Type"], "Zebra Tool")
+            write("Zebra Studio")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            self.assertEqual(search("zebra", "product")["results"][0]["Product Type"], "Zebra Studio")
+            self.assertEqual(core.cache_stats()["misses"], 2)
+
+
+class IndexCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        original = core.DATA_DIR, core.INDEX_DIR
+        self.addCleanup(setattr, core, "DATA_DIR", original[0])
+        self.addCleanup(setattr, core, "INDEX_DIR", original[1])
+        for cache in (core._INDEXES, core.RESULT_CACHE):
+            cache.clear()
+            self.addCleanup(cache.clear)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        core.DATA_DIR, core.INDEX_DIR = Path(tmp.name), Path(tmp.name) / ".cache"
+        self.csv = Path(shutil.copy(original[0] / "products.csv", tmp.name))
+        self.expected = search("fintech dashboard", "product", 2)["results"]
+        del core.LOAD_TIMINGS[:]
+
+    def load(self):
+        """Search with the in-memory caches cleared, returning (results, load source)"""
+        core._INDEXES.clear()
+        core.RESULT_CACHE.clear()
+        results = search("fintech dashboard", "product", 2)["results"]
+        return results, core.LOAD_TIMINGS[-1][1]
+
+    def test_reused_from_disk(self):
+        with mock.patch.object(core, "_build_index", side_effect=AssertionError("rebuilt")):
+            self.assertEqual(self.load(), (self.expected, "disk"))
+
+    def test_touched_but_unchanged(self):
+        info = self.csv.stat()
+        os.utime(self.csv, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+        with mock.patch.object(core, "_build_index", side_effect=AssertionError("rebuilt")):
+            self.assertEqual(self.load(), (self.expected, "disk"))
+        config = core.CSV_CONFIG["product"]
+        index = core._read_index(core._index_path(self.csv, config["search_cols"], config["output_cols"]))
+        self.assertEqual(index["source"]["signature"], core._file_signature(self.csv))
+
+    def test_stale_files_removed(self):
+        stale = [core.INDEX_DIR / "products.00000000.json", core.INDEX_DIR / "products.00000000.rows"]
+        kept = [core.INDEX_DIR / "colors.00000000.json", core.INDEX_DIR / "unified.json"]
+        for path in stale + kept:
+            path.write_text("{}", encoding='utf-8')
+        self.csv.write_text(self.csv.read_text(encoding='utf-8') + "\n", encoding='utf-8')  # Forces a rebuild
+        self.assertEqual(self.load(), (self.expected, "build"))
+        self.assertEqual([path.exists() for path in stale + kept], [False, False, True, True])
+        self.assertEqual(len(list(core.INDEX_DIR.glob("products.*"))), 2)  # The current .json and .rows
+
+    def test_read_only_install(self):
+        blocker = core.DATA_DIR / "blocker"
+        blocker.write_text("", encoding='utf-8')
+        core.INDEX_DIR = blocker / ".cache"  # Cannot be created
+        for _ in range(2):
+            self.assertEqual(self.load(), (self.expected, "build"))
+        (_, (_, _, rows)), = core._INDEXES.values()
+        self.assertIsInstance(rows, CsvRows)  # No row store either: rows are read from the CSV
+
+
+class CsvStreamingTest(unittest.TestCase):
+
+    def test_rows_fetched_by_offset(self):
+        text = 'No,Name,Notes\r\n1,Alpha,"multi\r\nline, ""quoted"""\r\n\r\n2,Beta\r\n3,Gamma,plain\r\n'
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rows.csv"
+            path.write_bytes(text.encode('utf-8'))
+            with open(path, 'r', encoding='utf-8') as f:
+                expected = list(csv.DictReader(f))
+
+            streamed = list(_stream_csv(path))
+            self.assertEqual([row for _, row in streamed], expected)
+            self.assertEqual([row for _, row in _stream_csv(path, ["Name"])], [{"Name": row["Name"]} for row in expected])
+
+            rows = CsvRows(path, _csv_header(path), ["Name", "Notes"], [offset for offset, _ in streamed])
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(rows[0], ["Alpha", 'multi\nline, "quoted"'])
+            self.assertEqual(rows.row(1), expected[1])
+
+    def test_stray_quote_in_unquoted_field(self):
+        text = 'No,Name\n1,5" screen\n2,b\n3,c\n'
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rows.csv"
+            path.write_bytes(text.encode('utf-8'))
+            with open(path, 'r', encoding='utf-8') as f:
+                expected = list(csv.DictReader(f))
+
+            streamed = list(_stream_csv(path))
+            self.assertEqual(len(streamed), 3)
+            self.assertEqual([row for _, row in streamed], expected)
+            rows = CsvRows(path, _csv_header(path), ["Name"], [offset for offset, _ in streamed])
+            self.assertEqual([rows[idx] for idx in range(3)], [['5" screen'], ["b"], ["c"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
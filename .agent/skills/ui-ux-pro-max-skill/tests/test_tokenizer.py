@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tokenizer tests: CJK bigram indexing and Latin compatibility.
+Run: python -m unittest discover -s tests
+"""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import core
+from core import BM25, search, search_many
+from tokenizer import VOCAB, Vocabulary, get_tokenizer, tokenize, tokenize_cjk
+
+
+class CjkTokenizerTest(unittest.TestCase):
+
+    def test_latin_text_unchanged(self):
+        for text in ["Dark Mode (OLED)", "glass-morphism, UI/UX kit", "a an the SaaS"]:
+            self.assertEqual(tokenize_cjk(text), tokenize(text))
+
+    def test_cjk_runs_become_bigrams(self):
+        self.assertEqual(tokenize_cjk("金融App 仪表盘，车"), ["金融", "fintech", "app", "仪表", "表盘", "dashboard", "车"])
+
+    def test_longest_chinese_term_wins(self):
+        self.assertEqual(tokenize_cjk("深色模式")[-2:], ["dark", "mode"])
+        self.assertEqual(tokenize_cjk("无衬线")[-1:], ["sans"])
+
+    def test_chinese_query_on_shipped_data(self):
+        self.assertEqual(core.detect_domain("金融仪表盘"), "product")
+        self.assertEqual(core.detect_domain("电商 配色"), "color")
+        result = search("深色 仪表盘", max_results=3)
+        self.assertEqual(result["domain"], "product")
+        self.assertEqual(result["results"], search("dark dashboard", "product", 3)["results"])
+
+    def test_chinese_query_matches(self):
+        docs = ["金融仪表盘 深色主题", "电商 购物车 结算页面", "fintech dashboard"]
+        cjk, latin = BM25(tokenizer="cjk"), BM25(tokenizer="latin")
+        cjk.fit(docs)
+        latin.fit(docs)
+        self.assertEqual([idx for idx, _ in cjk.top_k("购物车结算", 3)], [1])
+        self.assertEqual(latin.top_k("购物车结算", 3), [])
+
+    def test_tokenizer_round_trips_through_index(self):
+        bm25 = BM25(tokenizer="latin")
+        bm25.fit(["dark mode"])
+        self.assertEqual(BM25.from_dict(bm25.to_dict()).tokenizer, "latin")
+
+    def test_unknown_tokenizer(self):
+        with self.assertRaises(ValueError):
+            get_tokenizer("jieba")
+
+
+class VocabularyTest(unittest.TestCase):
+
+    def assertConsistent(self, vocab):
+        self.assertEqual(len(vocab.ids), len(vocab.terms))
+        for token_id, term in enumerate(vocab.terms):
+            self.assertEqual(vocab.ids[term], token_id)
+
+    def test_concurrent_interning(self):
+        vocab = Vocabulary()
+        tokens = [f"term{i}" for i in range(20000)]
+        barrier = threading.Barrier(8)
+
+        def load():
+            barrier.wait()
+            vocab.encode(tokens)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(len(vocab), len(tokens))
+        self.assertConsistent(vocab)
+
+    def test_concurrent_index_load(self):
+        core.RESULT_CACHE.clear()
+        for cache in (core._INDEXES, core._SCORERS):
+            cache.clear()
+        requests = [("dark glass", "style", 2), ("fintech", "color", 2), ("saas", "product", 2),
+                    ("serif", "typography", 2), ("hero", "landing", 2), ("focus", "ux", 2)]
+        self.assertEqual(search_many(requests, workers=6), [search(*request) for request in requests])
+        self.assertConsistent(VOCAB)
+
+
+if __name__ == "__main__":
+    unittest.main()